@@ -75,4 +75,17 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Los datos cargados viven en este cache y deben verse desde todos los workers:
+# FileBasedCache se comparte entre procesos de la misma máquina (LocMemCache no).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('DATAFRAME_CACHE_DIR', str(BASE_DIR / '.cache' / 'dataframes')),
+    }
+}
+
+DATAFRAME_CACHE_TIMEOUT = 60 * 60
+
+HYPERGEOMETRIC_TABLE_PATH = BASE_DIR / 'hypergeometric_tables.npz'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -1,10 +1,17 @@
+import io
+import time
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 from django.urls import reverse
 
 from data_manager.forms import PostgresImportForm
+from services.data_processor import DataProcessingError, DataProcessor
+from services.dataframe_store import DataFrameStore, DataFrameStoreError
 from services.postgres_importer import PostgresConfig, PostgresImportError, PostgresImporter
 
 
@@ -162,10 +169,12 @@ class PostgresUploadViewTests(TestCase):
 
         self.assertEqual(response.status_code, 302)
         session = self.client.session
-        self.assertIn("dataframe_json", session)
+        self.assertIn("dataframe_key", session)
+        self.assertIn("categoria", session["dataframe_schema"])
         self.assertIn("columns_info", session)
         self.assertIn("preview_data", session)
         self.assertEqual(session["columns_info"]["categoria"]["type"], "categorical")
+        self.assertEqual(session["categorical_columns"], ["escenario", "categoria"])
         fetch_sales_dataframe.assert_called_once()
 
 
@@ -219,3 +228,361 @@ class PostgresAnalysisCompatibilityTests(TestCase):
         self.assertEqual(analysis["N"], 5)
         self.assertEqual(analysis["K"], 3)
         self.assertEqual(analysis["p"], 0.6)
+
+
+class DataFrameStoreTests(TestCase):
+    def setUp(self):
+        self.cache = LocMemCache("dataframe-store-tests", {})
+
+    def test_unique_values_reads_single_column_without_nulls(self):
+        df = pd.DataFrame({"categoria": ["Vendido", None, "No vendido", "Vendido"], "unidades": [1, 2, 3, 4]})
+
+        key = DataFrameStore.save(df, self.cache)
+
+        self.assertCountEqual(
+            DataFrameStore.unique_values(key, self.cache, "categoria"),
+            ["Vendido", "No vendido"],
+        )
+        self.assertEqual(len(DataFrameStore.load(key, self.cache)), 4)
+        self.assertEqual(list(DataFrameStore.load(key, self.cache, columns=["unidades"]).columns), ["unidades"])
+
+    def test_save_accepts_mixed_type_columns(self):
+        df = pd.DataFrame({"codigo": [1, "A", 2.5, None]})
+
+        key = DataFrameStore.save(df, self.cache)
+
+        self.assertCountEqual(DataFrameStore.unique_values(key, self.cache, "codigo"), ["1", "A", "2.5"])
+
+    def test_recently_saved_table_is_served_from_process_memory(self):
+        key = DataFrameStore.save(pd.DataFrame({"categoria": ["Vendido", "No vendido"]}), self.cache)
+        self.cache.clear()
+
+        self.assertCountEqual(DataFrameStore.unique_values(key, self.cache, "categoria"), ["Vendido", "No vendido"])
+
+        DataFrameStore.delete(key, self.cache)
+        with self.assertRaises(DataFrameStoreError):
+            DataFrameStore.load(key, self.cache)
+
+    def test_missing_key_raises_store_error(self):
+        with self.assertRaises(DataFrameStoreError):
+            DataFrameStore.load("inexistente", self.cache)
+
+    def test_timeout_none_never_expires_in_process_memory(self):
+        key = DataFrameStore.save(pd.DataFrame({"categoria": ["Vendido"]}), self.cache, timeout=None)
+        self.cache.clear()
+
+        with patch("services.dataframe_store.time.monotonic", return_value=time.monotonic() + 10 * DataFrameStore.LIVE_TTL):
+            self.assertEqual(DataFrameStore.unique_values(key, self.cache, "categoria"), ["Vendido"])
+
+    def test_default_cache_is_shared_between_processes(self):
+        cache = caches["default"]
+        key = DataFrameStore.save(pd.DataFrame({"categoria": ["Vendido", "No vendido"]}), cache)
+        self.addCleanup(DataFrameStore.delete, key, cache)
+        # Otro worker no tiene la tabla en memoria y debe leerla del cache compartido.
+        DataFrameStore._live_tables.pop(key)
+
+        self.assertNotIsInstance(cache, LocMemCache)
+        self.assertCountEqual(DataFrameStore.unique_values(key, cache, "categoria"), ["Vendido", "No vendido"])
+
+
+class AnalyzeColumnApiTests(TestCase):
+    @patch("data_manager.views.PostgresImporter.fetch_sales_dataframe")
+    def test_analyze_column_rejects_unknown_column(self, fetch_sales_dataframe):
+        fetch_sales_dataframe.return_value = pd.DataFrame({"categoria": ["Vendido", "No vendido"]})
+        self.client.post(
+            reverse("data_manager:upload"),
+            data={
+                "source": "postgres",
+                "pg_host": "192.168.1.10",
+                "pg_port": "5432",
+                "pg_database": "simulacion",
+                "pg_user": "postgres",
+                "pg_password": "secret",
+                "pg_escenario_id": "7",
+            },
+        )
+
+        response = self.client.post(
+            reverse("data_manager:api_analyze_column"),
+            data={"column_name": "inexistente", "success_category": "Vendido"},
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("no existe", response.json()["error"])
+
+    @patch("data_manager.views.PostgresImporter.fetch_sales_dataframe")
+    def test_repeated_analysis_is_served_from_cache(self, fetch_sales_dataframe):
+        fetch_sales_dataframe.return_value = pd.DataFrame({"categoria": ["Vendido", "Vendido", "No vendido"]})
+        self.client.post(
+            reverse("data_manager:upload"),
+            data={
+                "source": "postgres",
+                "pg_host": "192.168.1.10",
+                "pg_port": "5432",
+                "pg_database": "simulacion",
+                "pg_user": "postgres",
+                "pg_password": "secret",
+                "pg_escenario_id": "7",
+            },
+        )
+
+        with patch(
+            "data_manager.views.DataProcessor.analyze_categorical_column",
+            wraps=DataProcessor.analyze_categorical_column,
+        ) as analyze:
+            for _ in range(2):
+                response = self.client.post(
+                    reverse("data_manager:api_analyze_column"),
+                    data={"column_name": "categoria", "success_category": "Vendido"},
+                )
+                self.assertEqual(response.json()["analysis"]["K"], 2)
+
+        analyze.assert_called_once()
+
+
+class LegacySessionMigrationTests(TestCase):
+    def test_json_dataframe_from_older_sessions_is_moved_to_the_store(self):
+        session = self.client.session
+        session["dataframe_json"] = pd.DataFrame({"categoria": ["Vendido", "No vendido", "Vendido"]}).to_json()
+        session.save()
+
+        response = self.client.get(reverse("data_manager:api_column_categories"), data={"column": "categoria"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(response.json()["categories"], ["Vendido", "No vendido"])
+        session = self.client.session
+        self.assertNotIn("dataframe_json", session)
+        self.assertIn("dataframe_key", session)
+
+
+class DataProcessorColumnsInfoTests(TestCase):
+    def test_columns_info_mixes_numeric_categorical_and_empty_columns(self):
+        df = pd.DataFrame({
+            'amount': [1.0, 2.0, None],
+            'status': ['ok', 'fail', None],
+            'empty': [float('nan')] * 3,
+        })
+
+        info = DataProcessor.get_columns_info(df)
+
+        self.assertEqual(info['amount']['type'], 'numeric')
+        self.assertEqual(info['amount']['null_count'], 1)
+        self.assertEqual(info['amount']['max'], 2.0)
+        self.assertEqual(info['status']['type'], 'categorical')
+        self.assertEqual(info['status']['value_counts'], {'ok': 1, 'fail': 1})
+        self.assertIsNone(info['empty']['mean'])
+
+    def test_preview_rows_are_capped_and_use_native_values(self):
+        df = pd.DataFrame({'count': range(150), 'label': ['a', 'b', 'c'] * 50})
+
+        preview = DataProcessor.get_preview_data(df)
+
+        self.assertEqual(preview['preview_rows'], 100)
+        self.assertEqual(len(preview['rows']), 100)
+        self.assertEqual(preview['rows'][1], [1, 'b'])
+        self.assertIsInstance(preview['rows'][1][0], int)
+        self.assertEqual(preview['headers'], ['count', 'label'])
+
+    def test_preview_rows_of_arrow_frames_use_none_for_nulls(self):
+        df = pd.DataFrame({
+            'monto': pd.Series([1, None], dtype='int64[pyarrow]'),
+            'estado': pd.Series(['ok', None], dtype='category'),
+        })
+
+        preview = DataProcessor.get_preview_data(df)
+
+        self.assertEqual(preview['rows'], [[1, 'ok'], [None, None]])
+
+
+class CsvUploadTests(TestCase):
+    def test_csv_with_dates_booleans_and_latin1_text_is_uploaded(self):
+        content = "fecha,activo,monto,estado\n2024-01-01,true,10,Vendió\n2024-01-02,false,,No vendió\n"
+        data_file = SimpleUploadedFile("ventas.csv", content.encode("latin-1"), content_type="text/csv")
+
+        response = self.client.post(reverse("data_manager:upload"), data={"data_file": data_file})
+
+        self.assertEqual(response.status_code, 302)
+        session = self.client.session
+        self.assertEqual(session["columns_info"]["fecha"]["type"], "categorical")
+        self.assertEqual(session["columns_info"]["activo"]["type"], "numeric")
+        self.assertEqual(session["columns_info"]["monto"]["null_count"], 1)
+        self.assertEqual(session["preview_data"]["rows"][0][0], "2024-01-01")
+        self.assertCountEqual(session["columns_info"]["estado"]["unique_values"], ["Vendió", "No vendió"])
+
+    def test_read_file_falls_back_to_c_engine_for_ragged_rows(self):
+        data_file = SimpleUploadedFile("datos.csv", b"a,b\n1,x\n2\n", content_type="text/csv")
+
+        df = DataProcessor.read_file(data_file)
+
+        self.assertEqual(len(df), 2)
+
+    def test_duplicate_headers_are_renamed_like_the_c_engine(self):
+        data_file = SimpleUploadedFile("datos.csv", b"a,a,b\n1,2,x\n3,4,y\n", content_type="text/csv")
+
+        df = DataProcessor.read_file(data_file)
+
+        self.assertEqual(list(df.columns), ["a", "a.1", "b"])
+        self.assertEqual(df["a.1"].tolist(), [2, 4])
+
+    def test_blank_headers_are_named_like_the_c_engine(self):
+        data_file = SimpleUploadedFile("datos.csv", b"a,,b,\n1,x,y,\n2,z,w,\n", content_type="text/csv")
+
+        df = DataProcessor.read_file(data_file)
+
+        self.assertEqual(list(df.columns), ["a", "Unnamed: 1", "b", "Unnamed: 3"])
+        self.assertEqual(df["Unnamed: 1"].tolist(), ["x", "z"])
+
+    def test_timestamps_keep_their_original_text(self):
+        data_file = SimpleUploadedFile(
+            "datos.csv", b"fecha,monto\n2024-01-01T10:00,1\n2024-01-02T11:30,2\n", content_type="text/csv"
+        )
+
+        df = DataProcessor.read_file(data_file)
+
+        self.assertEqual(df["fecha"].tolist(), ["2024-01-01T10:00", "2024-01-02T11:30"])
+
+    def test_all_empty_column_stays_numeric(self):
+        data_file = SimpleUploadedFile("datos.csv", b"a,vacia\n1,\n2,\n", content_type="text/csv")
+
+        df = DataProcessor.read_file(data_file)
+        info = DataProcessor.get_columns_info(df)
+
+        self.assertEqual(str(df["vacia"].dtype), "float64")
+        self.assertEqual(info["vacia"]["type"], "numeric")
+        self.assertIsNone(info["vacia"]["mean"])
+
+
+class CsvEncodingTests(TestCase):
+    def test_cp1252_euro_sign_is_decoded(self):
+        content = "producto,precio\nCafé,5€\nTé,3€\nAzúcar,2€\n"
+        data_file = SimpleUploadedFile("precios.csv", content.encode("cp1252"), content_type="text/csv")
+
+        df = DataProcessor.read_file(data_file)
+
+        self.assertEqual(df["precio"].tolist(), ["5€", "3€", "2€"])
+        self.assertEqual(df["producto"].tolist(), ["Café", "Té", "Azúcar"])
+
+    def test_utf8_bom_is_not_part_of_the_first_header(self):
+        content = "estado,monto\nVendió,10\nNo vendió,20\n"
+        data_file = SimpleUploadedFile("ventas.csv", b"\xef\xbb\xbf" + content.encode("utf-8"), content_type="text/csv")
+
+        df = DataProcessor.read_file(data_file)
+
+        self.assertEqual(list(df.columns), ["estado", "monto"])
+        self.assertEqual(df["estado"].tolist(), ["Vendió", "No vendió"])
+
+    def test_utf8_character_split_by_the_detection_sample_is_kept(self):
+        header = b"estado,nota\n"
+        padding = b"x" * (DataProcessor.ENCODING_SAMPLE_BYTES - 1 - len(header) - len(",a\nVendi"))
+        raw = header + padding + b",a\nVendi\xc3\xb3,b\n"
+        self.assertEqual(raw[DataProcessor.ENCODING_SAMPLE_BYTES - 1:DataProcessor.ENCODING_SAMPLE_BYTES + 1], b"\xc3\xb3")
+        data_file = SimpleUploadedFile("ventas.csv", raw, content_type="text/csv")
+
+        df = DataProcessor.read_file(data_file)
+
+        self.assertEqual(df["estado"].tolist()[-1], "Vendió")
+
+    def test_falls_back_to_latin1_when_utf8_fails(self):
+        content = "estado,monto\nVendió,10\nNo vendió,20\n"
+        data_file = SimpleUploadedFile("ventas.csv", content.encode("latin-1"), content_type="text/csv")
+
+        with patch("services.data_processor._HAS_CHARSET_NORMALIZER", False):
+            df = DataProcessor.read_file(data_file)
+
+        self.assertEqual(df["estado"].tolist(), ["Vendió", "No vendió"])
+
+
+class ExcelUploadTests(TestCase):
+    def test_excel_column_mixing_numbers_and_text_is_read(self):
+        buffer = io.BytesIO()
+        pd.DataFrame({"codigo": [1, "A", 2], "estado": ["ok", "ok", "fail"]}).to_excel(buffer, index=False)
+        data_file = SimpleUploadedFile("datos.xlsx", buffer.getvalue())
+
+        df = DataProcessor.read_file(data_file)
+
+        self.assertEqual(df["codigo"].tolist(), [1, "A", 2])
+
+
+class AutoCategorizeTests(TestCase):
+    def test_low_cardinality_text_columns_become_categories(self):
+        df = pd.DataFrame({
+            'estado': pd.Series(['ok', 'fail', 'ok', 'ok', None], dtype='string[pyarrow]'),
+            'codigo': ['a1', 'a2', 'a3', 'a4', 'a5'],
+            'monto': [1, 2, 3, 4, 5],
+        })
+
+        categorized = DataProcessor._auto_categorize(df)
+
+        self.assertIsInstance(categorized['estado'].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(categorized['codigo'].dtype, pd.CategoricalDtype)
+        self.assertEqual(categorized['monto'].dtype, df['monto'].dtype)
+
+        cache = LocMemCache('auto-categorize-tests', {})
+        key = DataFrameStore.save(categorized, cache)
+        self.assertCountEqual(DataFrameStore.unique_values(key, cache, 'estado'), ['ok', 'fail'])
+
+    def test_mixed_type_object_columns_are_not_categorized(self):
+        df = pd.DataFrame({'codigo': pd.Series([1, 'A', 1, 'A', 1, 'A'], dtype=object)})
+
+        categorized = DataProcessor._auto_categorize(df)
+
+        self.assertEqual(categorized['codigo'].dtype, object)
+        cache = LocMemCache('auto-categorize-tests', {})
+        key = DataFrameStore.save(categorized, cache)
+        self.assertCountEqual(DataFrameStore.unique_values(key, cache, 'codigo'), ['1', 'A'])
+
+    def test_store_accepts_category_with_mixed_categories(self):
+        df = pd.DataFrame({'codigo': pd.Series([1, 'A', 1], dtype=object).astype('category')})
+
+        cache = LocMemCache('auto-categorize-tests', {})
+        key = DataFrameStore.save(df, cache)
+
+        self.assertCountEqual(DataFrameStore.unique_values(key, cache, 'codigo'), ['1', 'A'])
+
+    def test_excel_with_low_cardinality_mixed_column_uploads(self):
+        buffer = io.BytesIO()
+        pd.DataFrame({'codigo': [1, 'A'] * 5, 'estado': ['ok', 'fail'] * 5}).to_excel(buffer, index=False)
+        data_file = SimpleUploadedFile('datos.xlsx', buffer.getvalue())
+
+        response = self.client.post(reverse('data_manager:upload'), data={'data_file': data_file})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('dataframe_key', self.client.session)
+
+
+class AnalyzeCategoricalColumnTests(TestCase):
+    def test_numeric_categories_match_text_input(self):
+        df = pd.DataFrame({'codigo': [1, 2, 1, 1]})
+
+        analysis = DataProcessor.analyze_categorical_column(df, 'codigo', '1')
+
+        self.assertEqual(analysis['N'], 4)
+        self.assertEqual(analysis['K'], 3)
+        self.assertEqual(analysis['categories'], {'1': 3, '2': 1})
+
+    def test_categories_are_capped_to_most_frequent(self):
+        df = pd.DataFrame({'cliente': ['frecuente'] * 10 + [f'c{i}' for i in range(120)]})
+
+        analysis = DataProcessor.analyze_categorical_column(df, 'cliente', 'c7')
+
+        self.assertEqual(analysis['N'], 130)
+        self.assertEqual(analysis['K'], 1)
+        self.assertEqual(len(analysis['categories']), DataProcessor.MAX_ANALYSIS_CATEGORIES)
+        self.assertEqual(analysis['categories']['frecuente'], 10)
+
+    def test_missing_category_is_rejected(self):
+        df = pd.DataFrame({'estado': ['ok', None, 'fail']})
+
+        with self.assertRaises(DataProcessingError):
+            DataProcessor.analyze_categorical_column(df, 'estado', 'pendiente')
+
+
+class DataFrameHtmlTableTests(TestCase):
+    def test_html_table_escapes_cells_and_marks_nulls(self):
+        df = pd.DataFrame({'estado': pd.Series(['<b>ok</b>', None], dtype='category'), 'monto': [1.5, None]})
+
+        html = DataProcessor.dataframe_to_html_table(df)
+
+        self.assertIn('<th>estado</th>', html)
+        self.assertIn('<td>&lt;b&gt;ok&lt;/b&gt;</td>', html)
+        self.assertEqual(html.count('<td>-</td>'), 2)
@@ -1,18 +1,23 @@
-import json
+import hashlib
 import io
 import os
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import render, redirect
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
 from scipy import stats
-import pandas as pd
 
 from services.data_processor import DataProcessor, DataProcessingError
+from services.dataframe_store import DataFrameStore, DataFrameStoreError
 from services.model_selector import ModelSelector, DistributionType
-from services.distributions import DistributionFactory, HypergeometricDistribution
+from services.distributions import DistributionFactory, HypergeometricDistribution, build_range_probs
 from services.postgres_importer import PostgresConfig, PostgresImporter, PostgresImportError
+from services.serialization import dumps_json, encode_float32
 from .forms import (
     FileUploadForm,
     ColumnSelectionForm,
@@ -32,6 +37,20 @@ def _postgres_config_from_form(form):
     )
 
 
+def _store_dataframe(request, df):
+    DataFrameStore.delete(request.session.get('dataframe_key'), cache)
+    request.session['dataframe_key'] = DataFrameStore.save(df, cache, settings.DATAFRAME_CACHE_TIMEOUT)
+    request.session['dataframe_schema'] = DataFrameStore.get_schema(df)
+
+
+def _migrate_legacy_dataframe(request):
+    # Sesiones anteriores guardaban el DataFrame completo como JSON; se pasa una sola vez al cache.
+    legacy_json = request.session.pop('dataframe_json', None)
+    if legacy_json is None or 'dataframe_key' in request.session:
+        return
+    _store_dataframe(request, pd.read_json(io.StringIO(legacy_json), dtype=False))
+
+
 def upload_view(request):
     upload_form = FileUploadForm()
     postgres_initial = {
@@ -48,7 +67,8 @@ def upload_view(request):
     file_loaded = False
     analysis = None
 
-    if 'dataframe_json' in request.session:
+    _migrate_legacy_dataframe(request)
+    if 'dataframe_key' in request.session:
         file_loaded = True
 
     if 'column_analysis' in request.session:
@@ -68,8 +88,9 @@ def upload_view(request):
                     preview_data = DataProcessor.get_preview_data(df)
                     columns_info = DataProcessor.get_columns_info(df)
 
-                    request.session['dataframe_json'] = df.to_json()
+                    _store_dataframe(request, df)
                     request.session['columns_info'] = columns_info
+                    request.session['categorical_columns'] = DataProcessor.get_categorical_columns(columns_info)
                     request.session['preview_data'] = preview_data
                     request.session['data_source'] = 'postgres'
                     _save_pg_config_to_session(request, postgres_form)
@@ -104,10 +125,7 @@ def upload_view(request):
                     preview_data = DataProcessor.get_preview_data(df)
                     columns_info = DataProcessor.get_columns_info(df)
                     
-                    categorical_columns = [
-                        col for col, info in columns_info.items() 
-                        if info['type'] == 'categorical'
-                    ]
+                    categorical_columns = DataProcessor.get_categorical_columns(columns_info)
                     
                     if not categorical_columns:
                         messages.warning(
@@ -115,8 +133,9 @@ def upload_view(request):
                             "No se encontraron columnas categóricas. Solo se mostrarán datos numéricos."
                         )
                     
-                    request.session['dataframe_json'] = df.to_json()
+                    _store_dataframe(request, df)
                     request.session['columns_info'] = columns_info
+                    request.session['categorical_columns'] = categorical_columns
                     request.session['preview_data'] = preview_data
                     
                     messages.success(request, f'Archivo cargado: {len(df)} filas, {len(df.columns)} columnas')
@@ -132,10 +151,9 @@ def upload_view(request):
         columns_info = request.session.get('columns_info')
         preview_data = request.session.get('preview_data')
         
-        categorical_columns = [
-            col for col, info in columns_info.items() 
-            if info['type'] == 'categorical'
-        ]
+        categorical_columns = request.session.get('categorical_columns')
+        if categorical_columns is None:
+            categorical_columns = DataProcessor.get_categorical_columns(columns_info)
         
         if categorical_columns:
             column_form = ColumnSelectionForm(
@@ -163,16 +181,17 @@ def upload_view(request):
 def get_column_categories(request):
     column_name = request.GET.get('column')
     
-    if not column_name or 'dataframe_json' not in request.session:
+    _migrate_legacy_dataframe(request)
+    if not column_name or 'dataframe_key' not in request.session:
         return JsonResponse({'error': 'Parámetros inválidos'}, status=400)
     
-    df = pd.read_json(io.StringIO(request.session['dataframe_json']))
-    
-    if column_name not in df.columns:
+    if column_name not in request.session.get('dataframe_schema', {}):
         return JsonResponse({'error': 'Columna no encontrada'}, status=404)
     
-    col_data = df[column_name].dropna()
-    categories = [str(cat) for cat in col_data.unique()]
+    try:
+        categories = DataFrameStore.unique_values(request.session['dataframe_key'], cache, column_name)
+    except DataFrameStoreError as e:
+        return JsonResponse({'error': str(e)}, status=400)
     
     return JsonResponse({
         'categories': categories,
@@ -180,6 +199,17 @@ def get_column_categories(request):
     })
 
 
+def _analyze_column_cached(dataframe_key, schema, column_name, success_category):
+    digest = hashlib.sha1(f'{column_name}\0{success_category}'.encode()).hexdigest()
+
+    def analyze():
+        columns = [column_name] if column_name in schema else []
+        df = DataFrameStore.load(dataframe_key, cache, columns=columns)
+        return DataProcessor.analyze_categorical_column(df, column_name, success_category)
+
+    return cache.get_or_set(f'anl:{dataframe_key}:{digest}', analyze, settings.DATAFRAME_CACHE_TIMEOUT)
+
+
 @require_http_methods(["POST"])
 def analyze_column(request):
     column_name = request.POST.get('column_name')
@@ -188,13 +218,17 @@ def analyze_column(request):
     if not column_name or not success_category:
         return JsonResponse({'error': 'Faltan parámetros'}, status=400)
     
-    if 'dataframe_json' not in request.session:
+    _migrate_legacy_dataframe(request)
+    if 'dataframe_key' not in request.session:
         return JsonResponse({'error': 'No hay datos cargados'}, status=400)
     
     try:
-        df = pd.read_json(io.StringIO(request.session['dataframe_json']))
-        
-        analysis = DataProcessor.analyze_categorical_column(df, column_name, success_category)
+        analysis = _analyze_column_cached(
+            request.session['dataframe_key'],
+            request.session.get('dataframe_schema', {}),
+            column_name,
+            success_category,
+        )
         
         request.session['column_analysis'] = analysis
         
@@ -203,7 +237,7 @@ def analyze_column(request):
             'analysis': analysis,
         })
         
-    except DataProcessingError as e:
+    except (DataProcessingError, DataFrameStoreError) as e:
         return JsonResponse({'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({'error': f'Error: {str(e)}'}, status=500)
@@ -219,7 +253,8 @@ def calculate_auto_view(request):
     if 'column_analysis' in request.session:
         analysis = request.session['column_analysis']
     
-    if 'dataframe_json' in request.session:
+    _migrate_legacy_dataframe(request)
+    if 'dataframe_key' in request.session:
         has_loaded_data = True
     
     if request.method == 'POST':
@@ -246,22 +281,14 @@ def calculate_auto_view(request):
                     if x is not None and x < len(chart_info['cumulative']):
                         cumulative_prob_x = chart_info['cumulative'][x]
                         
-                        range_probs = []
-                        cum_sum = 0
-                        for i in range(min(x + 1, len(chart_info['x_values']))):
-                            prob = chart_info['probabilities'][i]
-                            cum_sum += prob
-                            range_probs.append({
-                                'x': chart_info['x_values'][i],
-                                'p': round(prob, 4),
-                                'cumulative': round(cum_sum, 4)
-                            })
+                        range_probs = build_range_probs(
+                            chart_info['x_values'], chart_info['probabilities'], chart_info['cumulative'], x
+                        )
                         results['range_probabilities'] = range_probs
                     
                     chart_data = {
                         'labels': [str(val) for val in chart_info['x_values']],
-                        'values': chart_info['probabilities'],
-                        'cumulative': chart_info['cumulative'],
+                        'values_b64': encode_float32(chart_info['probabilities']),
                         'x_values': chart_info['x_values'],
                         'x_limit': x,
                         'mean': results['statistics']['mean'],
@@ -279,11 +306,10 @@ def calculate_auto_view(request):
                 errors.append(f'Error inesperado: {str(e)}')
                 messages.error(request, f'Error inesperado: {str(e)}')
         else:
-            error_items = dict(form.errors) if form.errors else {}
-            for field, field_errors in error_items.items():
-                for error in field_errors:
-                    errors.append(f'{field}: {error}')
-                    messages.error(request, f'{field}: {error}')
+            error_lines = [f'{field}: {error}' for field, field_errors in form.errors.items() for error in field_errors]
+            errors.extend(error_lines)
+            if error_lines:
+                messages.error(request, '\n'.join(error_lines))
     
     initial_data = {}
     if analysis:
@@ -295,7 +321,7 @@ def calculate_auto_view(request):
     context = {
         'form': form,
         'results': results,
-        'chart_data': json.dumps(chart_data) if chart_data else None,
+        'chart_data': dumps_json(chart_data) if chart_data else None,
         'errors': errors,
         'analysis': analysis,
         'has_loaded_data': has_loaded_data,
@@ -386,27 +412,14 @@ def hypergeometric_view(request):
                     get_probs_params = {k: v for k, v in dist_params.items() if k != 'x'}
                     x_values, probabilities = distribution.get_probabilities(**get_probs_params)
 
-                    cumulative_probs = []
-                    cumulative_sum = 0.0
-                    for prob in probabilities:
-                        cumulative_sum += prob
-                        cumulative_probs.append(round(cumulative_sum, 4))
+                    cumulative_probs = np.round(np.cumsum(np.asarray(probabilities, dtype=np.float64)), 4)
 
                     cumulative_prob_x = None
                     if x is not None:
                         if x < len(cumulative_probs):
-                            cumulative_prob_x = cumulative_probs[x]
-
-                        range_probs = []
-                        cum_sum = 0.0
-                        for i in range(min(x + 1, len(x_values))):
-                            prob = probabilities[i]
-                            cum_sum += prob
-                            range_probs.append({
-                                'x': x_values[i],
-                                'p': round(prob, 4),
-                                'cumulative': round(cum_sum, 4)
-                            })
+                            cumulative_prob_x = float(cumulative_probs[x])
+
+                        range_probs = build_range_probs(x_values, probabilities, cumulative_probs, x)
                         results['range_probabilities'] = range_probs
                         results['cumulative_prob_x'] = cumulative_prob_x
 
@@ -422,8 +435,7 @@ def hypergeometric_view(request):
                     
                     chart_data = {
                         'labels': [str(val) for val in x_values],
-                        'values': probabilities,
-                        'cumulative': cumulative_probs,
+                        'values_b64': encode_float32(probabilities),
                         'x_values': x_values,
                         'x_limit': x,
                         'mean': results['statistics']['mean'],
@@ -441,11 +453,10 @@ def hypergeometric_view(request):
                     errors.append(f'Error inesperado: {str(e)}')
                     messages.error(request, f'Error inesperado: {str(e)}')
             else:
-                if form.errors is not None:
-                    for field, field_errors in form.errors.items():
-                        for error in field_errors:
-                            errors.append(f'{field}: {error}')
-                            messages.error(request, f'{field}: {error}')
+                error_lines = [f'{field}: {error}' for field, field_errors in form.errors.items() for error in field_errors]
+                errors.extend(error_lines)
+                if error_lines:
+                    messages.error(request, '\n'.join(error_lines))
                 form = HypergeometricManualForm(initial=auto_params)
         elif auto_params:
             form = HypergeometricManualForm(initial=auto_params)
@@ -485,27 +496,14 @@ def hypergeometric_view(request):
                 get_probs_params = {k: v for k, v in dist_params.items() if k != 'x'}
                 x_values, probabilities = distribution.get_probabilities(**get_probs_params)
 
-                cumulative_probs = []
-                cumulative_sum = 0.0
-                for prob in probabilities:
-                    cumulative_sum += prob
-                    cumulative_probs.append(round(cumulative_sum, 4))
+                cumulative_probs = np.round(np.cumsum(np.asarray(probabilities, dtype=np.float64)), 4)
 
                 cumulative_prob_x = None
                 if x is not None:
                     if x < len(cumulative_probs):
-                        cumulative_prob_x = cumulative_probs[x]
-
-                    range_probs = []
-                    cum_sum = 0.0
-                    for i in range(min(x + 1, len(x_values))):
-                        prob = probabilities[i]
-                        cum_sum += prob
-                        range_probs.append({
-                            'x': x_values[i],
-                            'p': round(prob, 4),
-                            'cumulative': round(cum_sum, 4)
-                        })
+                        cumulative_prob_x = float(cumulative_probs[x])
+
+                    range_probs = build_range_probs(x_values, probabilities, cumulative_probs, x)
                     results['range_probabilities'] = range_probs
                     results['cumulative_prob_x'] = cumulative_prob_x
 
@@ -521,8 +519,7 @@ def hypergeometric_view(request):
                 
                 chart_data = {
                     'labels': [str(val) for val in x_values],
-                    'values': probabilities,
-                    'cumulative': cumulative_probs,
+                    'values_b64': encode_float32(probabilities),
                     'x_values': x_values,
                     'x_limit': x,
                     'mean': results['statistics']['mean'],
@@ -540,16 +537,15 @@ def hypergeometric_view(request):
                 errors.append(f'Error inesperado: {str(e)}')
                 messages.error(request, f'Error inesperado: {str(e)}')
         else:
-            if form.errors is not None:
-                for field, field_errors in form.errors.items():
-                    for error in field_errors:
-                        errors.append(f'{field}: {error}')
-                        messages.error(request, f'{field}: {error}')
+            error_lines = [f'{field}: {error}' for field, field_errors in form.errors.items() for error in field_errors]
+            errors.extend(error_lines)
+            if error_lines:
+                messages.error(request, '\n'.join(error_lines))
     
     context = {
         'form': form,
         'results': results,
-        'chart_data': json.dumps(chart_data) if chart_data else None,
+        'chart_data': dumps_json(chart_data) if chart_data else None,
         'errors': errors,
         'page_title': 'Distribución Hipergeométrica',
         'active_nav': 'hypergeometric',
@@ -604,7 +600,9 @@ def postgres_scenario_detail(request):
 
 
 def clear_session(request):
-    keys_to_clear = ['dataframe_json', 'columns_info', 'preview_data', 'column_analysis', 'data_source',
+    DataFrameStore.delete(request.session.get('dataframe_key'), cache)
+    keys_to_clear = ['dataframe_key', 'dataframe_schema', 'dataframe_json', 'columns_info', 'categorical_columns',
+                     'preview_data', 'column_analysis', 'data_source',
                      'pg_host', 'pg_port', 'pg_database', 'pg_user', 'pg_password']
     for key in keys_to_clear:
         if key in request.session:
@@ -1,5 +1,15 @@
+import os
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class DistribucionesConfig(AppConfig):
     name = 'distribuciones'
+
+    def ready(self):
+        from services.distributions import load_hypergeometric_tables
+
+        path = getattr(settings, 'HYPERGEOMETRIC_TABLE_PATH', None)
+        if path and os.path.exists(path):
+            load_hypergeometric_tables(str(path))
@@ -0,0 +1,34 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from services.distributions import load_hypergeometric_tables, save_hypergeometric_tables
+
+
+class Command(BaseCommand):
+    help = 'Precalcula tablas de probabilidad hipergeométrica para combinaciones N,K,n frecuentes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('triples', nargs='+', help='Combinaciones en formato N,K,n (por ejemplo 100,20,10)')
+
+    def handle(self, *args, **options):
+        path = str(settings.HYPERGEOMETRIC_TABLE_PATH)
+
+        triples = []
+        for raw in options['triples']:
+            try:
+                N, K, n = (int(part) for part in raw.split(','))
+            except ValueError as exc:
+                raise CommandError(f"Combinación inválida '{raw}': {exc}")
+            triples.append((N, K, n))
+
+        if os.path.exists(path):
+            load_hypergeometric_tables(path)
+
+        # save_hypergeometric_tables valida cada combinación antes de escribir el archivo.
+        try:
+            saved = save_hypergeometric_tables(path, triples)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f'Tabla guardada en {path} con {saved} combinaciones'))
@@ -1,10 +1,32 @@
+import base64
+import json
+import os
+import tempfile
 from typing import Any
+from unittest import skipUnless
+from unittest.mock import patch
 
+import numpy as np
+from django.core.management import CommandError, call_command
 from django.test import TestCase
 from django.urls import reverse
+from scipy import stats
 
+from services._kernels import HAS_NUMBA, binom_pmf_sweep, binom_pmf_sweep_py, hyper_pmf_sweep, hyper_pmf_sweep_py
 from services.acceptance_sampling import AcceptanceSamplingService
-from services.distributions import DistributionFactory, HypergeometricDistribution
+from services.distributions import (
+    CACHEABLE_TABLE_POINTS,
+    BinomialDistribution,
+    DistributionFactory,
+    HypergeometricDistribution,
+    PoissonDistribution,
+    _binomial_pmf_table,
+    _binomial_sweep,
+    _hypergeometric_pmf_table,
+    load_hypergeometric_tables,
+    save_hypergeometric_tables,
+)
+from services.model_selector import ModelSelector
 
 
 class AcceptanceSamplingServiceTests(TestCase):
@@ -114,3 +136,265 @@ class HypergeometricPoissonComparisonTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('poisson_comparison', response.context['results'])
         self.assertContains(response, 'Comparación Hipergeométrica vs Poisson')
+
+
+class BinomialProbabilitiesTests(TestCase):
+    def test_get_probabilities_matches_scalar_pmf(self):
+        distribution = BinomialDistribution()
+
+        x_values, probabilities = distribution.get_probabilities(n=12, p=0.35)
+
+        self.assertEqual(x_values, list(range(13)))
+        for x, probability in zip(x_values, probabilities):
+            self.assertAlmostEqual(probability, round(distribution.calculate_probability(12, 0.35, x) * 100, 4))
+        self.assertIsInstance(probabilities[0], float)
+
+    def test_large_sweeps_are_not_cached(self):
+        _binomial_sweep.cache_clear()
+
+        x_values, probabilities = BinomialDistribution().get_probabilities(n=CACHEABLE_TABLE_POINTS, p=0.5)
+
+        self.assertEqual(len(x_values), CACHEABLE_TABLE_POINTS + 1)
+        self.assertAlmostEqual(sum(probabilities), 100, places=2)
+        self.assertEqual(_binomial_sweep.cache_info().currsize, 0)
+
+
+class ScalarPmfTests(TestCase):
+    def test_binomial_scalar_pmf_matches_scipy(self):
+        for n, p in [(1, 0.5), (12, 0.35), (400, 0.02), (10, 0.0), (10, 1.0)]:
+            for x in range(n + 1):
+                self.assertAlmostEqual(BinomialDistribution().calculate_probability(n, p, x), stats.binom.pmf(x, n, p), places=12)
+
+    def test_hypergeometric_scalar_pmf_matches_scipy(self):
+        for N, K, n in [(60, 12, 15), (30, 29, 25), (10, 0, 5), (500, 250, 100)]:
+            for x in range(min(n, K) + 1):
+                self.assertAlmostEqual(HypergeometricDistribution().calculate_probability(N, K, n, x), stats.hypergeom.pmf(x, N, K, n), places=12)
+
+
+class PmfKernelTests(TestCase):
+    def test_binomial_kernel_matches_scipy(self):
+        for n, p in [(1, 0.5), (40, 0.35), (2000, 0.5), (800, 0.001), (10, 0.0), (10, 1.0)]:
+            out = np.empty(n + 1)
+            binom_pmf_sweep_py(n, p, out)
+            np.testing.assert_allclose(out, stats.binom.pmf(np.arange(n + 1), n, p), rtol=1e-9, atol=1e-300)
+
+    def test_hypergeometric_kernel_matches_scipy(self):
+        for N, K, n in [(60, 12, 15), (30, 29, 25), (10, 0, 5), (5000, 2500, 1200), (1000, 990, 600)]:
+            out = np.empty(min(n, K) + 1)
+            hyper_pmf_sweep_py(N, K, n, out)
+            np.testing.assert_allclose(out, stats.hypergeom.pmf(np.arange(min(n, K) + 1), N, K, n), rtol=1e-9, atol=1e-300)
+
+    @skipUnless(HAS_NUMBA, 'numba no está instalado')
+    def test_jitted_kernels_match_scipy(self):
+        for n, p in [(40, 0.35), (2000, 0.5), (800, 0.001)]:
+            out = np.empty(n + 1)
+            binom_pmf_sweep(n, p, out)
+            np.testing.assert_allclose(out, stats.binom.pmf(np.arange(n + 1), n, p), rtol=1e-9, atol=1e-300)
+        for N, K, n in [(60, 12, 15), (5000, 2500, 1200), (1000, 990, 600)]:
+            out = np.empty(min(n, K) + 1)
+            hyper_pmf_sweep(N, K, n, out)
+            np.testing.assert_allclose(out, stats.hypergeom.pmf(np.arange(min(n, K) + 1), N, K, n), rtol=1e-9, atol=1e-300)
+
+
+class PoissonProbabilitiesTests(TestCase):
+    def test_get_probabilities_matches_scalar_pmf(self):
+        distribution = PoissonDistribution()
+
+        x_values, probabilities = distribution.get_probabilities(lambda_param=3.5)
+
+        self.assertEqual(x_values, list(range(21)))
+        for x, probability in zip(x_values, probabilities):
+            self.assertAlmostEqual(probability, round(distribution.calculate_probability(3.5, x) * 100, 4))
+        self.assertIsInstance(x_values[0], int)
+
+
+class HypergeometricProbabilitiesTests(TestCase):
+    def test_get_probabilities_matches_scalar_pmf(self):
+        distribution = HypergeometricDistribution()
+
+        x_values, probabilities = distribution.get_probabilities(N=60, K=12, n=15)
+
+        self.assertEqual(x_values, list(range(13)))
+        for x, probability in zip(x_values, probabilities):
+            self.assertAlmostEqual(probability, round(distribution.calculate_probability(60, 12, 15, x) * 100, 4))
+
+    def test_median_matches_scipy(self):
+        for N, K, n in [(60, 12, 15), (100, 50, 20), (30, 29, 25), (10, 0, 5)]:
+            self.assertEqual(HypergeometricDistribution().calculate_median(N, K, n), int(stats.hypergeom.median(N, K, n)))
+
+    def test_median_when_cdf_is_exactly_one_half(self):
+        for (N, K, n), expected in [((10, 5, 3), 1), ((286, 1, 143), 0), ((60, 30, 23), 11)]:
+            self.assertEqual(HypergeometricDistribution().calculate_median(N, K, n), expected)
+
+    def test_repeated_parameters_return_equal_sweeps(self):
+        distribution = HypergeometricDistribution()
+
+        first = distribution.get_probabilities(N=60, K=12, n=15)
+        first[1].append(0.0)
+        second = distribution.get_probabilities(N=60, K=12, n=15)
+
+        self.assertEqual(len(second[1]), 13)
+
+    def test_large_pmf_tables_are_not_cached(self):
+        _hypergeometric_pmf_table.cache_clear()
+        n = CACHEABLE_TABLE_POINTS + 1
+
+        pmf, cdf = _hypergeometric_pmf_table(4 * n, 2 * n, n)
+
+        self.assertEqual(len(pmf), n + 1)
+        self.assertAlmostEqual(cdf[-1], 1.0)
+        self.assertEqual(_hypergeometric_pmf_table.cache_info().currsize, 0)
+
+
+class HypergeometricTablePersistenceTests(TestCase):
+    def setUp(self):
+        preloaded = patch.dict('services.distributions._preloaded_hypergeometric_pmfs', clear=True)
+        preloaded.start()
+        self.addCleanup(preloaded.stop)
+        self.addCleanup(_hypergeometric_pmf_table.cache_clear)
+
+    def test_saved_tables_are_loaded_back(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'tablas.npz')
+
+            self.assertEqual(save_hypergeometric_tables(path, [(60, 12, 15)]), 1)
+            self.assertEqual(load_hypergeometric_tables(path), 1)
+
+        with patch('services.distributions.gammaln', side_effect=AssertionError('tabla recalculada')):
+            x_values, probabilities = HypergeometricDistribution().get_probabilities(N=60, K=12, n=15)
+        self.assertEqual(len(x_values), 13)
+        self.assertAlmostEqual(sum(probabilities), 100.0, places=2)
+
+    def test_command_rejects_invalid_triples(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'tablas.npz')
+
+            with self.settings(HYPERGEOMETRIC_TABLE_PATH=path), self.assertRaises(CommandError):
+                call_command('build_hypergeometric_table', '10,20,5')
+
+            self.assertFalse(os.path.exists(path))
+
+
+class ChartPayloadTests(TestCase):
+    def test_binomial_chart_values_are_sent_as_float32_base64(self):
+        response: Any = self.client.post(reverse('distribuciones:binomial'), data={'n': 10, 'p': 0.3, 'x': 3})
+
+        chart_data = json.loads(response.context['chart_data'])
+        values = np.frombuffer(base64.b64decode(chart_data['values_b64']), dtype='<f4')
+        _, probabilities = BinomialDistribution().get_probabilities(n=10, p=0.3)
+
+        np.testing.assert_allclose(values, probabilities, rtol=1e-6)
+        self.assertNotIn('values', chart_data)
+
+
+class FormErrorMessagesTests(TestCase):
+    def test_invalid_form_reports_all_errors_in_one_message(self):
+        response: Any = self.client.post(reverse('distribuciones:binomial'), data={'n': '', 'p': '', 'x': ''})
+
+        error_messages = [message for message in response.context['messages'] if 'error' in message.tags]
+        self.assertEqual(len(error_messages), 1)
+        self.assertGreaterEqual(len(response.context['errors']), 2)
+
+
+class AutoSelectionChartDataTests(TestCase):
+    def test_cumulative_matches_running_sum(self):
+        calculation = ModelSelector.calculate_with_auto_selection(N=80, K=20, n=30, x=5)
+
+        chart = calculation['chart_data']
+        expected = []
+        running = 0.0
+        for prob in chart['probabilities']:
+            running += prob
+            expected.append(round(running, 4))
+        self.assertEqual(len(chart['cumulative']), len(expected))
+        for value, expected_value in zip(chart['cumulative'], expected):
+            self.assertAlmostEqual(value, expected_value, places=4)
+        self.assertIsInstance(chart['cumulative'][0], float)
+
+    def test_probability_x_is_read_from_the_sweep(self):
+        with patch.object(HypergeometricDistribution, 'calculate_probability') as scalar_pmf:
+            calculation = ModelSelector.calculate_with_auto_selection(N=80, K=20, n=30, x=5)
+
+        scalar_pmf.assert_not_called()
+        self.assertAlmostEqual(
+            calculation['results']['probability_x_pct'],
+            calculation['chart_data']['probabilities'][5],
+            places=4,
+        )
+
+    def test_large_sweeps_build_the_pmf_table_once(self):
+        n = CACHEABLE_TABLE_POINTS + 10_000
+        with patch('services.distributions._binomial_pmf_table', wraps=_binomial_pmf_table) as build_table:
+            calculation = ModelSelector.calculate_with_auto_selection(N=100 * n, K=50 * n, n=n, x=n // 2)
+
+        self.assertEqual(calculation['model_decision']['distribution_type'], 'binomial')
+        self.assertEqual(build_table.call_count, 1)
+        self.assertEqual(len(calculation['chart_data']['probabilities']), n + 1)
+
+    def test_x_is_still_validated_after_model_decision(self):
+        with self.assertRaises(ValueError):
+            ModelSelector.calculate_with_auto_selection(N=80, K=20, n=30, x=31)
+        with self.assertRaises(ValueError):
+            ModelSelector.calculate_with_auto_selection(N=1000, K=20, n=30, x=31)
+
+
+class MomentTests(TestCase):
+    def test_binomial_shape_matches_scipy(self):
+        for n, p in [(10, 0.3), (250, 0.02), (40, 0.5)]:
+            skewness, kurtosis = stats.binom.stats(n, p, moments='sk')
+            self.assertAlmostEqual(BinomialDistribution().calculate_skewness(n, p), float(skewness), places=10)
+            self.assertAlmostEqual(BinomialDistribution().calculate_kurtosis(n, p), float(kurtosis), places=10)
+
+    def test_hypergeometric_public_moments_match_calculate(self):
+        for N, K, n in [(60, 12, 15), (100, 50, 20), (500, 30, 100)]:
+            distribution = HypergeometricDistribution()
+            statistics = distribution.calculate(N=N, K=K, n=n)['statistics']
+
+            self.assertAlmostEqual(distribution.calculate_skewness(N, K, n), float(stats.hypergeom.stats(N, K, n, moments='s')), places=10)
+            self.assertAlmostEqual(statistics['skewness'], round(distribution.calculate_skewness(N, K, n), 6))
+            self.assertAlmostEqual(statistics['kurtosis'], round(distribution.calculate_kurtosis(N, K, n), 6))
+
+    def test_hypergeometric_kurtosis_of_full_population_sample_is_zero(self):
+        self.assertEqual(HypergeometricDistribution().calculate_kurtosis(20, 5, 20), 0)
+
+
+class InterpretationBoundaryTests(TestCase):
+    def test_skewness_boundaries_keep_original_buckets(self):
+        distribution = BinomialDistribution()
+
+        self.assertTrue(distribution.interpret_skewness(-0.5).startswith('Ligera asimetría negativa'))
+        self.assertTrue(distribution.interpret_skewness(-0.1).startswith('Ligera asimetría negativa'))
+        self.assertEqual(distribution.interpret_skewness(0.0), 'Distribución aproximadamente simétrica.')
+        self.assertTrue(distribution.interpret_skewness(0.1).startswith('Ligera asimetría positiva'))
+        self.assertTrue(distribution.interpret_skewness(0.5).startswith('Ligera asimetría positiva'))
+        self.assertTrue(distribution.interpret_skewness(0.51).startswith('Asimetría positiva significativa'))
+
+    def test_kurtosis_boundaries_are_mesokurtic(self):
+        self.assertTrue(BinomialDistribution().interpret_kurtosis(1).startswith('Mesocúrtica'))
+        self.assertTrue(HypergeometricDistribution().interpret_kurtosis(-1).startswith('Mesocúrtica'))
+        self.assertEqual(PoissonDistribution().interpret_kurtosis(0.5)[1], 'Mesocúrtica (campana de Gauss)')
+        self.assertEqual(PoissonDistribution().interpret_kurtosis(0.6)[1], 'Leptocúrtica')
+
+
+class DistributionFactoryTests(TestCase):
+    def test_create_is_case_insensitive_and_returns_fresh_instances(self):
+        first = DistributionFactory.create('Binomial')
+        second = DistributionFactory.create('binomial')
+
+        self.assertIsInstance(first, BinomialDistribution)
+        self.assertIsNot(first, second)
+
+    def test_register_replaces_previously_resolved_class(self):
+        class CustomBinomial(BinomialDistribution):
+            pass
+
+        DistributionFactory.create('binomial')
+        DistributionFactory.register('binomial', CustomBinomial)
+        try:
+            self.assertIsInstance(DistributionFactory.create('binomial'), CustomBinomial)
+        finally:
+            DistributionFactory.register('binomial', BinomialDistribution)
+
+    def test_unknown_distribution_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            DistributionFactory.create('normal')
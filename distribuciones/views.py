@@ -1,13 +1,14 @@
-import json
+import numpy as np
 from django.shortcuts import render
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
 
-from services.distributions import DistributionFactory
+from services.distributions import DistributionFactory, build_range_probs
 from services.acceptance_sampling import AcceptanceSamplingService
 from services.mm1 import MM1Calculator
 from services.model_selector import ModelSelector, DistributionType
+from services.serialization import dumps_json, encode_float32
 from .forms import BinomialDistributionForm, AcceptanceSamplingForm, PoissonDistributionForm, MM1QueueForm
 
 
@@ -105,20 +106,15 @@ def binomial_view(request):
                     get_probs_params = {k: v for k, v in distribution_params.items() if k != 'x'}
                     x_values, probabilities = distribution.get_probabilities(**get_probs_params)
 
-                    cumulative_probs = []
-                    cumulative_sum = 0.0
-                    for prob in probabilities:
-                        cumulative_sum += prob
-                        cumulative_probs.append(round(cumulative_sum, 4))
+                    cumulative_probs = np.round(np.cumsum(np.asarray(probabilities, dtype=np.float64)), 4)
 
                     cumulative_prob_x = None
                     if x is not None and x < len(cumulative_probs):
-                        cumulative_prob_x = cumulative_probs[x]
+                        cumulative_prob_x = float(cumulative_probs[x])
 
                     chart_data = {
                         'labels': [f'{i}' for i in x_values],
-                        'values': probabilities,
-                        'cumulative': cumulative_probs,
+                        'values_b64': encode_float32(probabilities),
                         'x_values': x_values,
                         'x_limit': x,
                         'mean': results['statistics']['mean'],
@@ -141,17 +137,7 @@ def binomial_view(request):
 
                     if x is not None:
                         results['cumulative_prob_x'] = cumulative_prob_x
-                        range_probs = []
-                        cum_sum = 0.0
-                        upper_limit = min(x + 1, len(x_values))
-                        for i in range(upper_limit):
-                            prob = probabilities[i]
-                            cum_sum += prob
-                            range_probs.append({
-                                'x': x_values[i],
-                                'p': prob,
-                                'cumulative': round(cum_sum, 4)
-                            })
+                        range_probs = build_range_probs(x_values, probabilities, cumulative_probs, x)
                         results['range_probabilities'] = range_probs
                     
                     messages.success(request, 'Datos importados y calculados automáticamente desde el archivo.')
@@ -163,12 +149,10 @@ def binomial_view(request):
                     errors.append(f'Error inesperado: {str(e)}')
                     messages.error(request, f'Error inesperado: {str(e)}')
             else:
-                form_errors = form.errors
-                if form_errors:
-                    for field, field_errors in form_errors.items():
-                        for error in field_errors:
-                            errors.append(f'{field}: {error}')
-                            messages.error(request, f'{field}: {error}')
+                error_lines = [f'{field}: {error}' for field, field_errors in form.errors.items() for error in field_errors]
+                errors.extend(error_lines)
+                if error_lines:
+                    messages.error(request, '\n'.join(error_lines))
                 form = BinomialDistributionForm(initial=auto_params)
         elif auto_params:
             form = BinomialDistributionForm(initial=auto_params)
@@ -212,20 +196,15 @@ def binomial_view(request):
                 get_probs_params = {k: v for k, v in distribution_params.items() if k != 'x'}
                 x_values, probabilities = distribution.get_probabilities(**get_probs_params)
 
-                cumulative_probs = []
-                cumulative_sum = 0.0
-                for prob in probabilities:
-                    cumulative_sum += prob
-                    cumulative_probs.append(round(cumulative_sum, 4))
+                cumulative_probs = np.round(np.cumsum(np.asarray(probabilities, dtype=np.float64)), 4)
 
                 cumulative_prob_x = None
                 if x is not None and x < len(cumulative_probs):
-                    cumulative_prob_x = cumulative_probs[x]
+                    cumulative_prob_x = float(cumulative_probs[x])
 
                 chart_data = {
                     'labels': [f'{i}' for i in x_values],
-                    'values': probabilities,
-                    'cumulative': cumulative_probs,
+                    'values_b64': encode_float32(probabilities),
                     'x_values': x_values,
                     'x_limit': x,
                     'mean': results['statistics']['mean'],
@@ -248,17 +227,7 @@ def binomial_view(request):
 
                 if x is not None:
                     results['cumulative_prob_x'] = cumulative_prob_x
-                    range_probs = []
-                    cum_sum = 0.0
-                    upper_limit = min(x + 1, len(x_values))
-                    for i in range(upper_limit):
-                        prob = probabilities[i]
-                        cum_sum += prob
-                        range_probs.append({
-                            'x': x_values[i],
-                            'p': prob,
-                            'cumulative': round(cum_sum, 4)
-                        })
+                    range_probs = build_range_probs(x_values, probabilities, cumulative_probs, x)
                     results['range_probabilities'] = range_probs
                 
                 messages.success(request, 'Cálculo realizado exitosamente')
@@ -270,17 +239,15 @@ def binomial_view(request):
                 errors.append(f'Error inesperado: {str(e)}')
                 messages.error(request, f'Error inesperado: {str(e)}')
         else:
-            form_errors = form.errors
-            if form_errors:
-                for field, field_errors in form_errors.items():
-                    for error in field_errors:
-                        errors.append(f'{field}: {error}')
-                        messages.error(request, f'{field}: {error}')
+            error_lines = [f'{field}: {error}' for field, field_errors in form.errors.items() for error in field_errors]
+            errors.extend(error_lines)
+            if error_lines:
+                messages.error(request, '\n'.join(error_lines))
     
     context = {
         'form': form,
         'results': results,
-        'chart_data': json.dumps(chart_data) if chart_data else None,
+        'chart_data': dumps_json(chart_data) if chart_data else None,
         'errors': errors,
         'page_title': 'Distribución Binomial',
         'active_nav': 'binomial',
@@ -333,18 +300,16 @@ def acceptance_sampling_view(request):
                 errors.append(f'Error inesperado: {str(e)}')
                 messages.error(request, f'Error inesperado: {str(e)}')
         else:
-            form_errors = form.errors
-            if form_errors:
-                for field, field_errors in form_errors.items():
-                    for error in field_errors:
-                        errors.append(f'{field}: {error}')
-                        messages.error(request, f'{field}: {error}')
+            error_lines = [f'{field}: {error}' for field, field_errors in form.errors.items() for error in field_errors]
+            errors.extend(error_lines)
+            if error_lines:
+                messages.error(request, '\n'.join(error_lines))
 
     context = {
         'form': form,
         'results': results,
-        'chart_data': json.dumps(chart_data) if chart_data else None,
-        'rows_json': json.dumps(results['rows']) if results else None,
+        'chart_data': dumps_json(chart_data) if chart_data else None,
+        'rows_json': dumps_json(results['rows']) if results else None,
         'errors': errors,
         'page_title': 'Muestreo para Aceptación de Lotes',
         'active_nav': 'acceptance_sampling',
@@ -385,17 +350,15 @@ def mm1_queue_view(request):
                 errors.append(f'Error inesperado: {str(e)}')
                 messages.error(request, f'Error inesperado: {str(e)}')
         else:
-            form_errors = form.errors
-            if form_errors:
-                for field, field_errors in form_errors.items():
-                    for error in field_errors:
-                        errors.append(f'{field}: {error}')
-                        messages.error(request, f'{field}: {error}')
+            error_lines = [f'{field}: {error}' for field, field_errors in form.errors.items() for error in field_errors]
+            errors.extend(error_lines)
+            if error_lines:
+                messages.error(request, '\n'.join(error_lines))
 
     context = {
         'form': form,
         'results': results,
-        'chart_data': json.dumps(chart_data) if chart_data else None,
+        'chart_data': dumps_json(chart_data) if chart_data else None,
         'errors': errors,
         'page_title': 'Colas de Espera: Modelo M/M/1',
         'active_nav': 'mm1_queue',
@@ -480,20 +443,15 @@ def poisson_view(request):
                     get_probs_params = {'lambda_param': lambda_param}
                     x_values, probabilities = distribution.get_probabilities(**get_probs_params)
                     
-                    cumulative_probs = []
-                    cumulative_sum = 0.0
-                    for prob in probabilities:
-                        cumulative_sum += prob
-                        cumulative_probs.append(round(cumulative_sum, 4))
+                    cumulative_probs = np.round(np.cumsum(np.asarray(probabilities, dtype=np.float64)), 4)
                     
                     cumulative_prob_x = None
                     if x is not None and x < len(cumulative_probs):
-                        cumulative_prob_x = cumulative_probs[x]
+                        cumulative_prob_x = float(cumulative_probs[x])
                     
                     chart_data = {
                         'labels': [f'{i}' for i in x_values],
-                        'values': probabilities,
-                        'cumulative': cumulative_probs,
+                        'values_b64': encode_float32(probabilities),
                         'x_values': x_values,
                         'x_limit': x,
                         'mean': results['statistics']['mean'],
@@ -511,17 +469,15 @@ def poisson_view(request):
                 errors.append(f'Error inesperado: {str(e)}')
                 messages.error(request, f'Error inesperado: {str(e)}')
         else:
-            form_errors = form.errors
-            if form_errors:
-                for field, field_errors in form_errors.items():
-                    for error in field_errors:
-                        errors.append(f'{field}: {error}')
-                        messages.error(request, f'{field}: {error}')
+            error_lines = [f'{field}: {error}' for field, field_errors in form.errors.items() for error in field_errors]
+            errors.extend(error_lines)
+            if error_lines:
+                messages.error(request, '\n'.join(error_lines))
     
     context = {
         'form': form,
         'results': results,
-        'chart_data': json.dumps(chart_data) if chart_data else None,
+        'chart_data': dumps_json(chart_data) if chart_data else None,
         'errors': errors,
         'page_title': 'Distribución de Poisson',
         'active_nav': 'poisson',
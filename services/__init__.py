@@ -2,7 +2,8 @@ from .distributions import (
     BaseDistribution, 
     BinomialDistribution, 
     HypergeometricDistribution, 
-    DistributionFactory
+    DistributionFactory,
+    build_range_probs,
 )
 from .data_processor import DataProcessor, DataProcessingError
 from .model_selector import ModelSelector, ModelDecision, DistributionType
@@ -13,6 +14,7 @@ __all__ = [
     'BinomialDistribution', 
     'HypergeometricDistribution',
     'DistributionFactory',
+    'build_range_probs',
     'DataProcessor',
     'DataProcessingError',
     'ModelSelector',
@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Por debajo de este tamaño la compilación JIT no compensa y se usa SciPy.
+JIT_MIN_N = 500
+
+
+def log_comb_scalar(total: int, chosen: int) -> float:
+    return math.lgamma(total + 1) - math.lgamma(chosen + 1) - math.lgamma(total - chosen + 1)
+
+
+# Los kernels llaman a este alias; con numba apunta a la versión compilada de la misma función.
+_log_comb = log_comb_scalar
+
+
+# Las recurrencias parten de la moda (evaluada en escala logaritmica) para que las colas no se anulen por underflow.
+def binom_pmf_sweep_py(n: int, p: float, out: np.ndarray) -> None:
+    out[:] = 0.0
+    if p == 0.0:
+        out[0] = 1.0
+        return
+    if p == 1.0:
+        out[n] = 1.0
+        return
+
+    q = 1.0 - p
+    mode = min(int((n + 1) * p), n)
+    out[mode] = math.exp(_log_comb(n, mode) + mode * math.log(p) + (n - mode) * math.log1p(-p))
+
+    ratio = p / q
+    for x in range(mode, n):
+        out[x + 1] = out[x] * (n - x) / (x + 1) * ratio
+    for x in range(mode, 0, -1):
+        out[x - 1] = out[x] * x / (n - x + 1) / ratio
+
+
+def hyper_pmf_sweep_py(N: int, K: int, n: int, out: np.ndarray) -> None:
+    out[:] = 0.0
+    lower = max(0, n - (N - K))
+    upper = min(n, K)
+    mode = min(max(int((n + 1) * (K + 1) / (N + 2)), lower), upper)
+    out[mode] = math.exp(_log_comb(K, mode) + _log_comb(N - K, n - mode) - _log_comb(N, n))
+
+    for x in range(mode, upper):
+        out[x + 1] = out[x] * (K - x) * (n - x) / ((x + 1) * (N - K - n + x + 1))
+    for x in range(mode, lower, -1):
+        out[x - 1] = out[x] * x * (N - K - n + x) / ((K - x + 1) * (n - x + 1))
+
+
+if HAS_NUMBA:
+    _log_comb = njit(cache=True)(log_comb_scalar)
+    binom_pmf_sweep = njit(cache=True, fastmath=True)(binom_pmf_sweep_py)
+    hyper_pmf_sweep = njit(cache=True, fastmath=True)(hyper_pmf_sweep_py)
+else:
+    binom_pmf_sweep = binom_pmf_sweep_py
+    hyper_pmf_sweep = hyper_pmf_sweep_py
@@ -1,8 +1,22 @@
 import pandas as pd
+import pyarrow as pa
 from typing import Dict, List, Any, Optional, Tuple
+from html import escape
 from io import BytesIO
 import os
 
+try:
+    import python_calamine  # noqa: F401
+    _HAS_CALAMINE = True
+except ImportError:
+    _HAS_CALAMINE = False
+
+try:
+    import charset_normalizer
+    _HAS_CHARSET_NORMALIZER = True
+except ImportError:
+    _HAS_CHARSET_NORMALIZER = False
+
 
 class DataProcessingError(Exception):
     pass
@@ -11,6 +25,11 @@ class DataProcessingError(Exception):
 class DataProcessor:
     ALLOWED_EXTENSIONS = ['.xlsx', '.xls', '.csv']
     MAX_FILE_SIZE = 10 * 1024 * 1024
+    ENCODING_SAMPLE_BYTES = 64 * 1024
+    CANDIDATE_ENCODINGS = ['utf_8', 'cp1252']
+    # cp1252 antes que latin-1: coinciden salvo en 0x80-0x9F, donde cp1252 tiene '€', comillas, etc.
+    FALLBACK_ENCODINGS = ['cp1252', 'latin-1']
+    MAX_ANALYSIS_CATEGORIES = 50
     
     @staticmethod
     def validate_file(file_obj) -> Tuple[bool, str]:
@@ -33,6 +52,63 @@ class DataProcessor:
         
         return True, "Archivo válido"
     
+    @staticmethod
+    def _excel_engine(ext: str) -> Optional[str]:
+        if _HAS_CALAMINE:
+            return 'calamine'
+        return 'openpyxl' if ext == '.xlsx' else None
+    
+    @staticmethod
+    def _detect_encoding(raw: bytes) -> str:
+        # Un archivo UTF-8 válido no necesita detección; además la muestra podría cortar un carácter multibyte.
+        try:
+            raw.decode('utf-8')
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+        
+        if _HAS_CHARSET_NORMALIZER:
+            # Sin restringir candidatos, muestras cortas en español se confunden con páginas de códigos DOS.
+            match = charset_normalizer.from_bytes(
+                raw[:DataProcessor.ENCODING_SAMPLE_BYTES],
+                cp_isolation=DataProcessor.CANDIDATE_ENCODINGS,
+            ).best()
+            if match is not None and match.encoding not in ('ascii', 'utf_8'):
+                return match.encoding
+        return 'utf-8'
+    
+    @staticmethod
+    def _read_csv(file_obj, encoding: str) -> pd.DataFrame:
+        try:
+            df = pd.read_csv(file_obj, encoding=encoding, engine='pyarrow', dtype_backend='pyarrow')
+        except (ValueError, pa.ArrowException):
+            df = None
+        
+        # El motor de pyarrow es más estricto y difiere del motor C en encabezados y fechas:
+        # no renombra 'a', 'a' como 'a', 'a.1', deja '' en lugar de 'Unnamed: N' y convierte
+        # las fechas ISO a timestamps, con lo que el texto original se pierde. En esos casos
+        # se relee con el motor C, que además da los mensajes de error habituales.
+        if (
+            df is None
+            or df.columns.has_duplicates
+            or (df.columns == '').any()
+            or any(pa.types.is_temporal(dtype.pyarrow_dtype) for dtype in df.dtypes)
+        ):
+            file_obj.seek(0)
+            df = pd.read_csv(file_obj, encoding=encoding, dtype_backend='pyarrow')
+        
+        conversions = {}
+        for col, dtype in df.dtypes.items():
+            arrow_type = dtype.pyarrow_dtype
+            if pa.types.is_binary(arrow_type) or pa.types.is_large_binary(arrow_type):
+                # pyarrow no valida la codificación y deja los bytes sin decodificar.
+                raise UnicodeDecodeError(encoding, b'', 0, 1, f"columna '{col}' no decodificable")
+            if pa.types.is_null(arrow_type):
+                # Columnas completamente vacías siguen siendo numéricas (float64) como antes.
+                conversions[col] = 'float64'
+        
+        return df.astype(conversions) if conversions else df
+    
     @staticmethod
     def read_file(file_obj) -> pd.DataFrame:
         filename = getattr(file_obj, 'name', '')
@@ -40,13 +116,20 @@ class DataProcessor:
         
         try:
             if ext in ['.xlsx', '.xls']:
-                df = pd.read_excel(file_obj, engine='openpyxl' if ext == '.xlsx' else None)
+                # Sin dtype_backend='pyarrow': Arrow rechaza columnas de Excel que mezclan números y texto.
+                df = pd.read_excel(file_obj, engine=DataProcessor._excel_engine(ext))
             elif ext == '.csv':
-                try:
-                    df = pd.read_csv(file_obj, encoding='utf-8')
-                except UnicodeDecodeError:
-                    file_obj.seek(0)
-                    df = pd.read_csv(file_obj, encoding='latin-1')
+                # Se lee el archivo una sola vez; los reintentos reutilizan los mismos bytes.
+                raw = file_obj.read()
+                encodings = list(dict.fromkeys([DataProcessor._detect_encoding(raw)] + DataProcessor.FALLBACK_ENCODINGS))
+                for encoding in encodings[:-1]:
+                    try:
+                        df = DataProcessor._read_csv(BytesIO(raw), encoding)
+                        break
+                    except UnicodeDecodeError:
+                        continue
+                else:
+                    df = DataProcessor._read_csv(BytesIO(raw), encodings[-1])
             else:
                 raise DataProcessingError(f"Formato no soportado: {ext}")
             
@@ -56,7 +139,7 @@ class DataProcessor:
             if len(df.columns) == 0:
                 raise DataProcessingError("El archivo no tiene columnas válidas")
             
-            return df
+            return DataProcessor._auto_categorize(df)
         
         except pd.errors.EmptyDataError:
             raise DataProcessingError("El archivo CSV está vacío")
@@ -67,35 +150,72 @@ class DataProcessor:
                 raise
             raise DataProcessingError(f"Error al leer el archivo: {str(e)}")
     
+    @staticmethod
+    def _is_categorical(col_data: pd.Series) -> bool:
+        dtype = col_data.dtype
+        return str(dtype) in ('object', 'str') or pd.api.types.is_string_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype)
+    
+    @staticmethod
+    def _auto_categorize(df: pd.DataFrame, threshold_ratio: float = 0.5) -> pd.DataFrame:
+        # Solo columnas de texto homogeneas; una columna object que mezcla numeros y texto se deja igual.
+        text_columns = [
+            col for col, dtype in df.dtypes.items()
+            if not isinstance(dtype, pd.CategoricalDtype)
+            and DataProcessor._is_categorical(df[col])
+            and (dtype != object or pd.api.types.infer_dtype(df[col], skipna=True) == 'string')
+        ]
+        if not text_columns:
+            return df
+        
+        # Columnas de texto con pocos valores distintos se guardan como códigos de categoría.
+        nunique = df[text_columns].nunique(dropna=True)
+        low_cardinality = nunique[nunique / len(df) < threshold_ratio].index
+        if low_cardinality.empty:
+            return df
+        return df.astype({col: 'category' for col in low_cardinality})
+    
     @staticmethod
     def get_columns_info(df: pd.DataFrame) -> Dict[str, Any]:
-        columns_info = {}
+        total_rows = len(df)
+        non_null_counts = df.count().tolist()
+        categorical_flags = [DataProcessor._is_categorical(df.iloc[:, i]) for i in range(df.shape[1])]
+        numeric_positions = [
+            i for i in range(df.shape[1])
+            if not categorical_flags[i]
+            and (pd.api.types.is_numeric_dtype(df.iloc[:, i]) or pd.api.types.is_bool_dtype(df.iloc[:, i]))
+        ]
+        
+        # Las estadisticas numericas se calculan en una sola pasada sobre todas las columnas numericas.
+        numeric_stats: Dict[int, List[Any]] = {}
+        if numeric_positions:
+            described = df.iloc[:, numeric_positions].astype('float64').agg(['min', 'max', 'mean', 'std'])
+            for offset, position in enumerate(numeric_positions):
+                numeric_stats[position] = described.iloc[:, offset].tolist()
         
-        for col in df.columns:
-            col_data = df[col]
-            non_null = col_data.dropna()
+        columns_info = {}
+        for i, col in enumerate(df.columns):
+            col_data = df.iloc[:, i]
+            non_null_count = non_null_counts[i]
             
             info = {
                 'name': str(col),
-                'total_rows': len(df),
-                'non_null_count': len(non_null),
-                'null_count': len(df) - len(non_null),
+                'total_rows': total_rows,
+                'non_null_count': non_null_count,
+                'null_count': total_rows - non_null_count,
                 'dtype': str(col_data.dtype),
             }
             
-            dtype_str = str(col_data.dtype)
-            if dtype_str in ('object', 'str') or pd.api.types.is_string_dtype(col_data) or pd.api.types.is_categorical_dtype(col_data):
+            if categorical_flags[i]:
+                non_null = col_data.dropna()
                 unique_values = non_null.unique()
                 info['type'] = 'categorical'
                 info['unique_count'] = len(unique_values)
                 info['unique_values'] = [str(v) for v in unique_values[:20]]
-                info['value_counts'] = {str(k): int(v) for k, v in non_null.value_counts().head(10).items()}
-            elif pd.api.types.is_numeric_dtype(col_data):
+                info['value_counts'] = {str(k): v for k, v in non_null.value_counts().head(10).to_dict().items()}
+            elif i in numeric_stats:
                 info['type'] = 'numeric'
-                info['min'] = float(non_null.min()) if len(non_null) > 0 else None
-                info['max'] = float(non_null.max()) if len(non_null) > 0 else None
-                info['mean'] = float(non_null.mean()) if len(non_null) > 0 else None
-                info['std'] = float(non_null.std()) if len(non_null) > 0 else None
+                for stat, value in zip(('min', 'max', 'mean', 'std'), numeric_stats[i]):
+                    info[stat] = float(value) if non_null_count > 0 else None
             else:
                 info['type'] = 'other'
             
@@ -103,25 +223,30 @@ class DataProcessor:
         
         return columns_info
     
+    @staticmethod
+    def get_categorical_columns(columns_info: Dict[str, Any]) -> List[str]:
+        return [col for col, info in columns_info.items() if info['type'] == 'categorical']
+    
     @staticmethod
     def analyze_categorical_column(df: pd.DataFrame, column_name: str, success_category: str) -> Dict[str, Any]:
         if column_name not in df.columns:
             raise DataProcessingError(f"La columna '{column_name}' no existe en el archivo")
         
-        col_data = df[column_name].dropna()
-        N = len(col_data)
+        value_counts = df[column_name].value_counts(dropna=True)
+        N = int(value_counts.sum())
         
         if N == 0:
             raise DataProcessingError("La columna no contiene datos válidos")
         
-        value_counts = col_data.value_counts()
-        categories = {str(k): int(v) for k, v in value_counts.items()}
-        
-        K = categories.get(success_category, 0)
+        # Las categorías se comparan como texto, igual que llegan desde el formulario.
+        K = int(value_counts[value_counts.index.astype(str) == success_category].sum())
         
         if K == 0:
             raise DataProcessingError(f"La categoría '{success_category}' no existe en la columna o tiene 0 ocurrencias")
         
+        # Solo se conservan las categorías más frecuentes; N y K ya se calcularon sobre la columna completa.
+        categories = {str(k): int(v) for k, v in value_counts.head(DataProcessor.MAX_ANALYSIS_CATEGORIES).items()}
+        
         return {
             'N': N,
             'K': K,
@@ -134,22 +259,30 @@ class DataProcessor:
     @staticmethod
     def get_preview_data(df: pd.DataFrame, max_rows: int = 100) -> Dict[str, Any]:
         preview_df = df.head(max_rows)
+        columns = [str(col) for col in df.columns]
+        
+        try:
+            # Se leen las columnas directamente de los buffers de Arrow en lugar de convertir fila por fila.
+            table = pa.Table.from_pandas(preview_df, preserve_index=False)
+            rows = [list(row) for row in zip(*(column.to_pylist() for column in table.columns))]
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            rows = preview_df.to_dict(orient='split')['data']
         
         return {
-            'columns': [str(col) for col in df.columns],
-            'rows': preview_df.values.tolist()[:max_rows],
+            'columns': columns,
+            'rows': rows,
             'total_rows': len(df),
             'preview_rows': len(preview_df),
-            'headers': [str(col) for col in df.columns],
+            'headers': columns,
         }
     
     @staticmethod
     def dataframe_to_html_table(df: pd.DataFrame, max_rows: int = 50) -> str:
         preview_df = df.head(max_rows)
-        return preview_df.to_html(
-            classes='data-table',
-            index=False,
-            na_rep='-',
-            escape=True,
-            max_rows=max_rows
+        header = ''.join(f'<th>{escape(str(col))}</th>' for col in preview_df.columns)
+        # Los nulos se resuelven por celda; fillna('-') fallaria en columnas de categoria.
+        body = ''.join(
+            '<tr>' + ''.join('<td>-</td>' if pd.isna(value) else f'<td>{escape(str(value))}</td>' for value in row) + '</tr>'
+            for row in preview_df.itertuples(index=False, name=None)
         )
+        return f'<table class="dataframe data-table"><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>'
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+
+
+class DataFrameStoreError(Exception):
+    pass
+
+
+class DataFrameStore:
+    KEY_PREFIX = 'df:'
+    COMPRESSION = 'lz4'
+    BATCH_ROWS = 64 * 1024
+    LIVE_TTL = 60 * 60
+    MAX_LIVE_TABLES = 32
+
+    # Tablas ya decodificadas en este proceso; el cache de Django sigue siendo la fuente compartida.
+    _live_tables: Dict[str, Tuple[float, pa.Table]] = {}
+    _live_lock = threading.Lock()
+
+    @classmethod
+    def _remember(cls, key: str, table: pa.Table, timeout: Optional[int]) -> None:
+        now = time.monotonic()
+        with cls._live_lock:
+            expired = [live_key for live_key, (expires_at, _) in cls._live_tables.items() if expires_at <= now]
+            for live_key in expired:
+                del cls._live_tables[live_key]
+            while len(cls._live_tables) >= cls.MAX_LIVE_TABLES:
+                oldest_key = min(cls._live_tables, key=lambda live_key: cls._live_tables[live_key][0])
+                del cls._live_tables[oldest_key]
+            # Igual que en cache.set, timeout=None significa que no expira.
+            expires_at = float('inf') if timeout is None else now + timeout
+            cls._live_tables[key] = (expires_at, table)
+
+    @classmethod
+    def _recall(cls, key: str) -> Optional[pa.Table]:
+        with cls._live_lock:
+            entry = cls._live_tables.get(key)
+            if entry is None:
+                return None
+            expires_at, table = entry
+            if expires_at <= time.monotonic():
+                del cls._live_tables[key]
+                return None
+            return table
+
+    @staticmethod
+    def _to_table(df: pd.DataFrame) -> pa.Table:
+        try:
+            return pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Columnas con tipos mezclados (p. ej. numeros y texto) se guardan como texto,
+            # incluidas las categorias cuyos valores tambien son de tipos mezclados.
+            mixed_columns = [
+                col for col, dtype in df.dtypes.items()
+                if dtype == object or (isinstance(dtype, pd.CategoricalDtype) and dtype.categories.dtype == object)
+            ]
+            normalized = df.astype({col: 'string' for col in mixed_columns})
+            return pa.Table.from_pandas(normalized, preserve_index=False)
+
+    @classmethod
+    def save(cls, df: pd.DataFrame, cache: Any, timeout: Optional[int] = None) -> str:
+        key = f"{cls.KEY_PREFIX}{uuid.uuid4().hex}"
+        table = cls._to_table(df)
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression=cls.COMPRESSION)
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            for batch in table.to_batches(max_chunksize=cls.BATCH_ROWS):
+                writer.write_batch(batch)
+        cache.set(key, sink.getvalue().to_pybytes(), timeout)
+        cls._remember(key, table, timeout)
+        return key
+
+    @staticmethod
+    def get_schema(df: pd.DataFrame) -> Dict[str, str]:
+        schema = DataFrameStore._to_table(df.head(0)).schema
+        return {field.name: str(field.type) for field in schema}
+
+    @classmethod
+    def read_table(cls, key: str, cache: Any, columns: Optional[List[str]] = None) -> pa.Table:
+        table = cls._recall(key)
+        if table is not None:
+            return table if columns is None else table.select(columns)
+
+        payload = cache.get(key)
+        if payload is None:
+            raise DataFrameStoreError("Los datos cargados ya no están disponibles. Vuelva a cargar el archivo.")
+        if columns is not None:
+            return feather.read_table(pa.BufferReader(payload), columns=columns)
+
+        table = feather.read_table(pa.BufferReader(payload))
+        cls._remember(key, table, cls.LIVE_TTL)
+        return table
+
+    @staticmethod
+    def load(key: str, cache: Any, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return DataFrameStore.read_table(key, cache, columns=columns).to_pandas()
+
+    @staticmethod
+    def unique_values(key: str, cache: Any, column_name: str) -> List[str]:
+        column = DataFrameStore.read_table(key, cache, columns=[column_name]).column(column_name)
+        return [str(value) for value in pc.unique(pc.drop_null(column)).to_pylist()]
+
+    @classmethod
+    def delete(cls, key: Optional[str], cache: Any) -> None:
+        if key:
+            cache.delete(key)
+            with cls._live_lock:
+                cls._live_tables.pop(key, None)
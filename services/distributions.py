@@ -1,7 +1,180 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from typing import Dict, List, Any, Optional, Tuple, TypedDict, Unpack
+import bisect
+import functools
 import math
+import numpy as np
 from scipy import stats
+from scipy.special import gammaln
+
+from services._kernels import HAS_NUMBA, JIT_MIN_N, binom_pmf_sweep, hyper_pmf_sweep, log_comb_scalar
+
+
+PMF_TABLE_CACHE_SIZE = 32
+
+
+def _freeze(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+# lru_cache limita el número de entradas, no los bytes: las tablas con más puntos
+# que este umbral se calculan en cada llamada en lugar de quedarse en memoria.
+CACHEABLE_TABLE_POINTS = 20_000
+
+
+def _size_limited_cache(maxsize: int, points: Callable[..., int]) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorator(build: Callable[..., Any]) -> Callable[..., Any]:
+        cached = functools.lru_cache(maxsize=maxsize)(build)
+        
+        @functools.wraps(build)
+        def wrapper(*args: Any) -> Any:
+            if points(*args) > CACHEABLE_TABLE_POINTS:
+                return build(*args)
+            return cached(*args)
+        
+        wrapper.cache_clear = cached.cache_clear
+        wrapper.cache_info = cached.cache_info
+        return wrapper
+    return decorator
+
+
+@_size_limited_cache(PMF_TABLE_CACHE_SIZE, points=lambda n, p: n + 1)
+def _binomial_pmf_table(n: int, p: float) -> Tuple[np.ndarray, np.ndarray]:
+    if HAS_NUMBA and n > JIT_MIN_N:
+        pmf = np.empty(n + 1)
+        binom_pmf_sweep(n, p, pmf)
+    else:
+        pmf = stats.binom.pmf(np.arange(n + 1), n, p)
+    return _freeze(pmf), _freeze(np.cumsum(pmf))
+
+
+def _log_comb_array(total: Any, chosen: Any) -> Any:
+    return gammaln(total + 1) - gammaln(chosen + 1) - gammaln(total - chosen + 1)
+
+
+# Para un solo x se evita el despacho de scipy.stats y se evalua la formula en escala logaritmica.
+def _binom_pmf_scalar(n: int, p: float, x: int) -> float:
+    if x < 0 or x > n:
+        return 0.0
+    if p == 0:
+        return 1.0 if x == 0 else 0.0
+    if p == 1:
+        return 1.0 if x == n else 0.0
+    return math.exp(log_comb_scalar(n, x) + x * math.log(p) + (n - x) * math.log1p(-p))
+
+
+def _hypergeom_pmf_scalar(N: int, K: int, n: int, x: int) -> float:
+    if x < max(0, n - (N - K)) or x > min(n, K):
+        return 0.0
+    return math.exp(log_comb_scalar(K, x) + log_comb_scalar(N - K, n - x) - log_comb_scalar(N, n))
+
+
+HYPERGEOMETRIC_TABLE_CACHE_SIZE = 32
+
+_preloaded_hypergeometric_pmfs: Dict[Tuple[int, int, int], np.ndarray] = {}
+
+
+@_size_limited_cache(HYPERGEOMETRIC_TABLE_CACHE_SIZE, points=lambda N, K, n: min(n, K) + 1)
+def _hypergeometric_pmf_table(N: int, K: int, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    pmf = _preloaded_hypergeometric_pmfs.get((N, K, n))
+    if pmf is None and HAS_NUMBA and n > JIT_MIN_N:
+        pmf = np.empty(min(n, K) + 1)
+        hyper_pmf_sweep(N, K, n, pmf)
+        pmf = _freeze(pmf)
+    elif pmf is None:
+        # Se evalua en escala logaritmica para evitar desbordes con N grande; fuera del soporte la probabilidad es 0.
+        pmf = np.zeros(min(n, K) + 1)
+        lower = max(0, n - (N - K))
+        support = np.arange(lower, len(pmf))
+        pmf[lower:] = np.exp(_log_comb_array(K, support) + _log_comb_array(N - K, n - support) - _log_comb_array(N, n))
+        pmf = _freeze(pmf)
+    return pmf, _freeze(np.cumsum(pmf))
+
+
+SWEEP_CACHE_SIZE = 32
+
+
+# Solo se guardan los porcentajes redondeados; los valores de x se reconstruyen con range().
+@_size_limited_cache(SWEEP_CACHE_SIZE, points=lambda n, p: n + 1)
+def _binomial_sweep(n: int, p: float) -> np.ndarray:
+    pmf, _ = _binomial_pmf_table(n, p)
+    return _freeze(np.round(pmf * 100, 4))
+
+
+@_size_limited_cache(SWEEP_CACHE_SIZE, points=lambda N, K, n: min(n, K) + 1)
+def _hypergeometric_sweep(N: int, K: int, n: int) -> np.ndarray:
+    pmf, _ = _hypergeometric_pmf_table(N, K, n)
+    return _freeze(np.round(pmf * 100, 4))
+
+
+def load_hypergeometric_tables(path: str) -> int:
+    with np.load(path) as archive:
+        for name in archive.files:
+            N, K, n = (int(part) for part in name.split('_'))
+            _preloaded_hypergeometric_pmfs[(N, K, n)] = _freeze(archive[name])
+        loaded = len(archive.files)
+    _hypergeometric_pmf_table.cache_clear()
+    _hypergeometric_sweep.cache_clear()
+    return loaded
+
+
+def save_hypergeometric_tables(path: str, triples: List[Tuple[int, int, int]]) -> int:
+    distribution = HypergeometricDistribution()
+    for N, K, n in triples:
+        try:
+            distribution._validate_inputs(N, K, n)
+        except ValueError as exc:
+            raise ValueError(f"Combinación inválida ({N}, {K}, {n}): {exc}")
+    
+    tables = {key: pmf for key, pmf in _preloaded_hypergeometric_pmfs.items()}
+    for N, K, n in triples:
+        tables[(N, K, n)] = _hypergeometric_pmf_table(N, K, n)[0]
+    np.savez_compressed(path, **{f'{N}_{K}_{n}': pmf for (N, K, n), pmf in tables.items()})
+    return len(tables)
+
+
+def build_range_probs(x_values: Any, probabilities: Any, cumulative: Any, limit: int) -> List[Dict[str, Any]]:
+    upper = limit + 1
+    rounded_probs = np.round(np.asarray(probabilities[:upper], dtype=np.float64), 4).tolist()
+    rounded_cumulative = np.round(np.asarray(cumulative[:upper], dtype=np.float64), 4).tolist()
+    return [
+        {'x': int(x_value), 'p': prob, 'cumulative': cumulative_value}
+        for x_value, prob, cumulative_value in zip(x_values[:upper], rounded_probs, rounded_cumulative)
+    ]
+
+
+# Umbrales ordenados para bisect_right: cada intervalo es [umbral anterior, umbral siguiente).
+# nextafter desplaza los limites que en la logica original pertenecen al tramo inferior.
+_SKEW_THRESHOLDS = (-0.5, math.nextafter(-0.1, math.inf), 0.1, math.nextafter(0.5, math.inf))
+_SKEW_MSGS = (
+    "Asimetría negativa significativa: La distribución tiene una cola más larga hacia la izquierda.",
+    "Ligera asimetría negativa: La distribución tiende a inclinarse hacia la izquierda.",
+    "Distribución aproximadamente simétrica.",
+    "Ligera asimetría positiva: La distribución tiende a inclinarse hacia la derecha.",
+    "Asimetría positiva significativa: La distribución tiene una cola más larga hacia la derecha.",
+)
+
+_KURTOSIS_THRESHOLDS = (-1, math.nextafter(1, math.inf))
+_KURTOSIS_MSGS = (
+    "Platicúrtica: La distribución es más plana que una distribución normal (colas ligeras).",
+    "Mesocúrtica: La distribución tiene una forma similar a la campana de Gauss.",
+    "Leptocúrtica: La distribución es más puntiaguda que una distribución normal (colas pesadas).",
+)
+
+_POISSON_KURTOSIS_THRESHOLDS = (-0.5, math.nextafter(0.5, math.inf))
+_POISSON_KURTOSIS_MSGS = (
+    ("Platicúrtica: La distribución es más plana que una normal (colas ligeras).", "Platicúrtica"),
+    ("Mesocúrtica: La distribución tiene forma similar a la campana de Gauss.", "Mesocúrtica (campana de Gauss)"),
+    ("Leptocúrtica: La distribución es más picuda que una normal (colas pesadas).", "Leptocúrtica"),
+)
+
+
+def _lookup(value: float, thresholds: Tuple[float, ...], messages: Tuple[Any, ...], nan_message: Any) -> Any:
+    if math.isnan(value):
+        return nan_message
+    return messages[bisect.bisect_right(thresholds, value)]
 
 
 class BinomialParams(TypedDict, total=False):
@@ -37,17 +210,19 @@ class BinomialDistribution(BaseDistribution):
         self.N: Optional[int] = None
         self.is_finite: bool = False
     
-    def _validate_inputs(self, n: int, p: float, x: Optional[int] = None, N: Optional[int] = None) -> None:
-        if n <= 0:
-            raise ValueError("El tamaño de la muestra (n) debe ser mayor que 0")
-        if not 0 <= p <= 1:
-            raise ValueError("La probabilidad (p) debe estar entre 0 y 1")
+    def _validate_inputs(self, n: int, p: float, x: Optional[int] = None, N: Optional[int] = None, skip: bool = False) -> None:
+        if not skip:
+            if n <= 0:
+                raise ValueError("El tamaño de la muestra (n) debe ser mayor que 0")
+            if not 0 <= p <= 1:
+                raise ValueError("La probabilidad (p) debe estar entre 0 y 1")
         if x is not None and (x < 0 or x > n):
             raise ValueError(f"El número de éxitos (x) debe estar entre 0 y {n}")
-        if N is not None and N <= 0:
-            raise ValueError("El tamaño de la población (N) debe ser mayor que 0")
-        if N is not None and n > N:
-            raise ValueError("El tamaño de la muestra (n) no puede ser mayor que la población (N)")
+        if not skip:
+            if N is not None and N <= 0:
+                raise ValueError("El tamaño de la población (N) debe ser mayor que 0")
+            if N is not None and n > N:
+                raise ValueError("El tamaño de la muestra (n) no puede ser mayor que la población (N)")
     
     def _determine_population_type(self, n: int, N: Optional[int]) -> Tuple[bool, Optional[float]]:
         if N is None:
@@ -62,7 +237,7 @@ class BinomialDistribution(BaseDistribution):
         return math.sqrt((N - n) / (N - 1))
     
     def calculate_probability(self, n: int, p: float, x: int) -> float:
-        return float(stats.binom.pmf(x, n, p))
+        return _binom_pmf_scalar(n, p, x)
     
     def calculate_mean(self, n: int, p: float) -> float:
         return n * p
@@ -70,50 +245,38 @@ class BinomialDistribution(BaseDistribution):
     def calculate_variance(self, n: int, p: float) -> float:
         return n * p * (1 - p)
     
-    def calculate_std(self, n: int, p: float, N: Optional[int] = None) -> Tuple[float, Optional[float]]:
-        variance = self.calculate_variance(n, p)
+    def _std_from_variance(self, variance: float, n: int, N: Optional[int]) -> Tuple[float, Optional[float], Optional[float]]:
         std = math.sqrt(variance)
         
         if N is not None and n / N > 0.05:
             correction = self._calculate_correction_factor(n, N)
-            adjusted_std = std * correction
-            return std, adjusted_std
+            return std, std * correction, correction
         
-        return std, None
+        return std, None, None
     
-    def calculate_skewness(self, n: int, p: float) -> float:
+    def calculate_std(self, n: int, p: float, N: Optional[int] = None) -> Tuple[float, Optional[float]]:
+        std, adjusted_std, _ = self._std_from_variance(self.calculate_variance(n, p), n, N)
+        return std, adjusted_std
+    
+    def _moments(self, n: int, p: float) -> Tuple[float, float, float, float, float]:
         q = 1 - p
+        npq = n * p * q
+        std = math.sqrt(npq)
         if p == 0 or p == 1:
-            return 0
-        return (1 - 2 * p) / math.sqrt(n * p * q)
+            return n * p, npq, std, 0, 0
+        return n * p, npq, std, (1 - 2 * p) / std, (1 - 6 * p * q) / npq
+    
+    def calculate_skewness(self, n: int, p: float) -> float:
+        return self._moments(n, p)[3]
     
     def calculate_kurtosis(self, n: int, p: float) -> float:
-        q = 1 - p
-        if p == 0 or p == 1:
-            return 0
-        return (1 - 6 * p * q) / (n * p * q)
+        return self._moments(n, p)[4]
     
     def interpret_skewness(self, skewness: float) -> str:
-        if skewness < -0.5:
-            return "Asimetría negativa significativa: La distribución tiene una cola más larga hacia la izquierda."
-        elif skewness > 0.5:
-            return "Asimetría positiva significativa: La distribución tiene una cola más larga hacia la derecha."
-        elif -0.5 <= skewness <= 0.5:
-            if abs(skewness) < 0.1:
-                return "Distribución aproximadamente simétrica."
-            elif skewness < 0:
-                return "Ligera asimetría negativa: La distribución tiende a inclinarse hacia la izquierda."
-            else:
-                return "Ligera asimetría positiva: La distribución tiende a inclinarse hacia la derecha."
-        return "Simétrica"
+        return _lookup(skewness, _SKEW_THRESHOLDS, _SKEW_MSGS, "Simétrica")
     
     def interpret_kurtosis(self, kurtosis: float) -> str:
-        if kurtosis > 1:
-            return "Leptocúrtica: La distribución es más puntiaguda que una distribución normal (colas pesadas)."
-        elif kurtosis < -1:
-            return "Platicúrtica: La distribución es más plana que una distribución normal (colas ligeras)."
-        else:
-            return "Mesocúrtica: La distribución tiene una forma similar a la campana de Gauss."
+        return _lookup(kurtosis, _KURTOSIS_THRESHOLDS, _KURTOSIS_MSGS, _KURTOSIS_MSGS[1])
     
     def calculate(self, **kwargs: Any) -> Dict[str, Any]:
         n: int = kwargs.get('n')
@@ -121,7 +284,7 @@ class BinomialDistribution(BaseDistribution):
         x: Optional[int] = kwargs.get('x')
         N: Optional[int] = kwargs.get('N')
         
-        self._validate_inputs(n, p, x, N)
+        self._validate_inputs(n, p, x, N, skip=kwargs.get('_validated', False))
         
         self.n = n
         self.p = p
@@ -130,10 +293,8 @@ class BinomialDistribution(BaseDistribution):
         
         self.is_finite, ratio = self._determine_population_type(n, N)
         
-        mean = self.calculate_mean(n, p)
-        std, adjusted_std = self.calculate_std(n, p, N)
-        skewness = self.calculate_skewness(n, p)
-        kurtosis = self.calculate_kurtosis(n, p)
+        mean, variance, std, skewness, kurtosis = self._moments(n, p)
+        _, adjusted_std, correction = self._std_from_variance(variance, n, N)
         
         result: Dict[str, Any] = {
             'inputs': {
@@ -146,10 +307,10 @@ class BinomialDistribution(BaseDistribution):
             'population_ratio': ratio,
             'statistics': {
                 'mean': round(mean, 6),
-                'variance': round(self.calculate_variance(n, p), 6),
+                'variance': round(variance, 6),
                 'std': round(std, 6),
                 'adjusted_std': round(adjusted_std, 6) if adjusted_std else None,
-                'correction_factor': round(self._calculate_correction_factor(n, N), 6) if self.is_finite and N else None,
+                'correction_factor': round(correction, 6) if self.is_finite and N else None,
                 'skewness': round(skewness, 6),
                 'kurtosis': round(kurtosis, 6),
             },
@@ -160,8 +321,10 @@ class BinomialDistribution(BaseDistribution):
         }
         
         if x is not None:
-            result['probability_x'] = round(self.calculate_probability(n, p, x), 6)
-            result['probability_x_pct'] = round(self.calculate_probability(n, p, x) * 100, 4)
+            pmf_array = kwargs.get('_pmf_array')
+            px = float(pmf_array[x]) if pmf_array is not None else self.calculate_probability(n, p, x)
+            result['probability_x'] = round(px, 6)
+            result['probability_x_pct'] = round(px * 100, 4)
         
         return result
     
@@ -169,19 +332,18 @@ class BinomialDistribution(BaseDistribution):
         n: int = kwargs.get('n')
         p: float = kwargs.get('p')
         
-        x_values = list(range(n + 1))
-        probabilities = [round(self.calculate_probability(n, p, x) * 100, 4) for x in x_values]
-        return x_values, probabilities
+        return list(range(n + 1)), _binomial_sweep(n, p).tolist()
+    
+    def get_pmf_array(self, **kwargs: Any) -> np.ndarray:
+        return _binomial_pmf_table(kwargs.get('n'), kwargs.get('p'))[0]
     
     def get_statistics(self, **kwargs: Any) -> Dict[str, Any]:
         n: int = kwargs.get('n')
         p: float = kwargs.get('p')
         N: Optional[int] = kwargs.get('N')
         
-        mean = self.calculate_mean(n, p)
-        std, adjusted_std = self.calculate_std(n, p, N)
-        skewness = self.calculate_skewness(n, p)
-        kurtosis = self.calculate_kurtosis(n, p)
+        mean, variance, std, skewness, kurtosis = self._moments(n, p)
+        _, adjusted_std, _ = self._std_from_variance(variance, n, N)
         
         return {
             'mean': round(mean, 6),
@@ -205,18 +367,21 @@ class HypergeometricDistribution(BaseDistribution):
         self.K: Optional[int] = None
         self.n: Optional[int] = None
         self.x: Optional[int] = None
-    
-    def _validate_inputs(self, N: int, K: int, n: int, x: Optional[int] = None) -> None:
-        if N <= 0:
-            raise ValueError("El tamaño de la población (N) debe ser mayor que 0")
-        if K < 0:
-            raise ValueError("El número de éxitos en la población (K) no puede ser negativo")
-        if K > N:
-            raise ValueError("El número de éxitos en la población (K) no puede ser mayor que N")
-        if n <= 0:
-            raise ValueError("El tamaño de la muestra (n) debe ser mayor que 0")
-        if n > N:
-            raise ValueError("El tamaño de la muestra (n) no puede ser mayor que la población (N)")
+        self._median: Optional[Tuple[Tuple[int, int, int], int]] = None
+    
+    def _validate_inputs(self, N: int, K: int, n: int, x: Optional[int] = None, skip: bool = False) -> None:
+        # ModelSelector.decide ya valida N, K y n; x se valida siempre.
+        if not skip:
+            if N <= 0:
+                raise ValueError("El tamaño de la población (N) debe ser mayor que 0")
+            if K < 0:
+                raise ValueError("El número de éxitos en la población (K) no puede ser negativo")
+            if K > N:
+                raise ValueError("El número de éxitos en la población (K) no puede ser mayor que N")
+            if n <= 0:
+                raise ValueError("El tamaño de la muestra (n) debe ser mayor que 0")
+            if n > N:
+                raise ValueError("El tamaño de la muestra (n) no puede ser mayor que la población (N)")
         if x is not None:
             if x < 0:
                 raise ValueError("El número de éxitos en la muestra (x) no puede ser negativo")
@@ -226,7 +391,7 @@ class HypergeometricDistribution(BaseDistribution):
                 raise ValueError(f"El número de éxitos en la muestra (x) no puede ser mayor que K={K}")
     
     def calculate_probability(self, N: int, K: int, n: int, x: int) -> float:
-        return float(stats.hypergeom.pmf(x, N, K, n))
+        return _hypergeom_pmf_scalar(N, K, n, x)
     
     def calculate_mean(self, N: int, K: int, n: int) -> float:
         return n * (K / N)
@@ -240,78 +405,81 @@ class HypergeometricDistribution(BaseDistribution):
         variance = self.calculate_variance(N, K, n)
         return math.sqrt(variance)
     
-    def calculate_skewness(self, N: int, K: int, n: int) -> float:
-        if N == 1:
-            return 0
-        p = K / N
-        q = 1 - p
-        numerator = (N - 2 * K) * math.sqrt(N - 1) * (N - 2 * n)
-        denominator = math.sqrt(n * K * (N - K) * (N - n)) * (N - 2)
-        if denominator == 0:
-            return 0
-        return numerator / denominator
-    
-    def calculate_kurtosis(self, N: int, K: int, n: int) -> float:
-        if N <= 3:
-            return 0
-        p = K / N
-        q = 1 - p
+    def _hyper_shape(self, N: int, K: int, n: int) -> Tuple[float, float]:
+        spread = n * K * (N - K) * (N - n)
         
-        term1 = (N - 1) * (N * (N + 1) - 6 * K * (N - K) * (N - n) / (n * (N - n)))
-        term2 = 3 * n * K * (N - K) * (N - n) / (n * (N - n))
-        numerator = term1 - term2
+        skewness = 0
+        if N != 1:
+            denominator = math.sqrt(spread) * (N - 2)
+            if denominator != 0:
+                skewness = (N - 2 * K) * math.sqrt(N - 1) * (N - 2 * n) / denominator
         
-        denominator = n * K * (N - K) * (N - n) * (N - 2) * (N - 3) / (N - 1)
-        if denominator == 0:
-            return 0
+        kurtosis = 0
+        if N > 3:
+            # El denominador se revisa antes: con n = N el término n * (N - n) también es 0.
+            denominator = spread * (N - 2) * (N - 3) / (N - 1)
+            if denominator != 0:
+                term1 = (N - 1) * (N * (N + 1) - 6 * K * (N - K) * (N - n) / (n * (N - n)))
+                term2 = 3 * spread / (n * (N - n))
+                kurtosis = (N + 1) * (term1 - term2) / denominator
         
-        excess_kurtosis = (N + 1) * numerator / denominator
-        return excess_kurtosis
+        return skewness, kurtosis
+    
+    def _hyper_moments(self, N: int, K: int, n: int) -> Tuple[float, float, float, float, float]:
+        variance = self.calculate_variance(N, K, n)
+        skewness, kurtosis = self._hyper_shape(N, K, n)
+        return self.calculate_mean(N, K, n), variance, math.sqrt(variance), skewness, kurtosis
+    
+    def calculate_skewness(self, N: int, K: int, n: int) -> float:
+        return self._hyper_shape(N, K, n)[0]
+    
+    def calculate_kurtosis(self, N: int, K: int, n: int) -> float:
+        return self._hyper_shape(N, K, n)[1]
     
     def calculate_median(self, N: int, K: int, n: int) -> int:
-        mean = self.calculate_mean(N, K, n)
-        floor_mean = int(mean)
-        ceil_mean = floor_mean + 1
-        
-        prob_floor = self.calculate_probability(N, K, n, floor_mean)
-        prob_ceil = self.calculate_probability(N, K, n, ceil_mean) if ceil_mean <= min(n, K) else 0
-        
-        cumulative = 0
-        for x in range(min(n, K) + 1):
-            cumulative += self.calculate_probability(N, K, n, x)
-            if cumulative >= 0.5:
-                return x
-        return floor_mean
+        if self._median is not None and self._median[0] == (N, K, n):
+            return self._median[1]
+
+        _, cdf = _hypergeometric_pmf_table(N, K, n)
+        # Tolerancia: la CDF acumulada puede quedar apenas bajo 0.5 cuando el valor exacto es 0.5.
+        median = min(int(np.searchsorted(cdf, 0.5 - 1e-9)), min(n, K))
+        self._median = ((N, K, n), median)
+        return median
 
     def calculate_poisson_lambda(self, N: int, K: int, n: int) -> float:
         return n * (K / N)
 
     def build_poisson_comparison(self, N: int, K: int, n: int, x: Optional[int] = None) -> Dict[str, Any]:
         lambda_param = self.calculate_poisson_lambda(N, K, n)
-        poisson_distribution = PoissonDistribution()
 
         max_x = min(n, K)
-        comparison_rows = []
-        probability_x_pct = None
-        poisson_probability_x_pct = None
-        absolute_difference_pct = None
+        x_values = np.arange(max_x + 1)
+        hyper_probabilities, _ = _hypergeometric_pmf_table(N, K, n)
+        poisson_probabilities = stats.poisson.pmf(x_values, lambda_param)
 
-        for current_x in range(max_x + 1):
-            hyper_probability = self.calculate_probability(N, K, n, current_x)
-            poisson_probability = poisson_distribution.calculate_probability(lambda_param, current_x)
-            difference = abs(hyper_probability - poisson_probability)
+        hyper_pct = np.round(hyper_probabilities * 100, 6).tolist()
+        poisson_pct = np.round(poisson_probabilities * 100, 6).tolist()
+        difference_pct = np.round(np.abs(hyper_probabilities - poisson_probabilities) * 100, 6).tolist()
 
-            comparison_rows.append({
+        comparison_rows = [
+            {
                 'x': current_x,
-                'hypergeometric_probability_pct': round(hyper_probability * 100, 6),
-                'poisson_probability_pct': round(poisson_probability * 100, 6),
-                'absolute_difference_pct': round(difference * 100, 6),
-            })
+                'hypergeometric_probability_pct': hyper_value,
+                'poisson_probability_pct': poisson_value,
+                'absolute_difference_pct': difference_value,
+            }
+            for current_x, hyper_value, poisson_value, difference_value in zip(
+                x_values.tolist(), hyper_pct, poisson_pct, difference_pct
+            )
+        ]
 
-            if x is not None and current_x == x:
-                probability_x_pct = round(hyper_probability * 100, 6)
-                poisson_probability_x_pct = round(poisson_probability * 100, 6)
-                absolute_difference_pct = round(difference * 100, 6)
+        probability_x_pct = None
+        poisson_probability_x_pct = None
+        absolute_difference_pct = None
+        if x is not None and 0 <= x <= max_x:
+            probability_x_pct = hyper_pct[x]
+            poisson_probability_x_pct = poisson_pct[x]
+            absolute_difference_pct = difference_pct[x]
 
         return {
             'lambda': round(lambda_param, 6),
@@ -335,12 +503,7 @@ class HypergeometricDistribution(BaseDistribution):
         return interpretation, round(mean, 6), median
     
     def interpret_kurtosis(self, kurtosis: float) -> str:
-        if kurtosis > 1:
-            return "Leptocúrtica: La distribución es más puntiaguda que una distribución normal (colas pesadas)."
-        elif kurtosis < -1:
-            return "Platicúrtica: La distribución es más plana que una distribución normal (colas ligeras)."
-        else:
-            return "Mesocúrtica: La distribución tiene una forma similar a la campana de Gauss."
+        return _lookup(kurtosis, _KURTOSIS_THRESHOLDS, _KURTOSIS_MSGS, _KURTOSIS_MSGS[1])
     
     def calculate(self, **kwargs: Any) -> Dict[str, Any]:
         N: int = kwargs.get('N')
@@ -348,7 +511,7 @@ class HypergeometricDistribution(BaseDistribution):
         n: int = kwargs.get('n')
         x: Optional[int] = kwargs.get('x')
         
-        self._validate_inputs(N, K, n, x)
+        self._validate_inputs(N, K, n, x, skip=kwargs.get('_validated', False))
         
         self.N = N
         self.K = K
@@ -357,11 +520,7 @@ class HypergeometricDistribution(BaseDistribution):
         
         p = K / N
         
-        mean = self.calculate_mean(N, K, n)
-        variance = self.calculate_variance(N, K, n)
-        std = self.calculate_std(N, K, n)
-        skewness = self.calculate_skewness(N, K, n)
-        kurtosis = self.calculate_kurtosis(N, K, n)
+        mean, variance, std, skewness, kurtosis = self._hyper_moments(N, K, n)
         
         skewness_interp, mean_val, median_val = self.interpret_skewness_by_median(N, K, n)
         
@@ -390,8 +549,10 @@ class HypergeometricDistribution(BaseDistribution):
         }
         
         if x is not None:
-            result['probability_x'] = round(self.calculate_probability(N, K, n, x), 6)
-            result['probability_x_pct'] = round(self.calculate_probability(N, K, n, x) * 100, 4)
+            pmf_array = kwargs.get('_pmf_array')
+            px = float(pmf_array[x]) if pmf_array is not None else self.calculate_probability(N, K, n, x)
+            result['probability_x'] = round(px, 6)
+            result['probability_x_pct'] = round(px * 100, 4)
 
         result['poisson_comparison'] = self.build_poisson_comparison(N, K, n, x)
          
@@ -402,20 +563,17 @@ class HypergeometricDistribution(BaseDistribution):
         K: int = kwargs.get('K')
         n: int = kwargs.get('n')
         
-        max_x = min(n, K)
-        x_values = list(range(max_x + 1))
-        probabilities = [round(self.calculate_probability(N, K, n, x) * 100, 4) for x in x_values]
-        return x_values, probabilities
+        return list(range(min(n, K) + 1)), _hypergeometric_sweep(N, K, n).tolist()
+    
+    def get_pmf_array(self, **kwargs: Any) -> np.ndarray:
+        return _hypergeometric_pmf_table(kwargs.get('N'), kwargs.get('K'), kwargs.get('n'))[0]
     
     def get_statistics(self, **kwargs: Any) -> Dict[str, Any]:
         N: int = kwargs.get('N')
         K: int = kwargs.get('K')
         n: int = kwargs.get('n')
         
-        mean = self.calculate_mean(N, K, n)
-        std = self.calculate_std(N, K, n)
-        skewness = self.calculate_skewness(N, K, n)
-        kurtosis = self.calculate_kurtosis(N, K, n)
+        mean, _, std, skewness, kurtosis = self._hyper_moments(N, K, n)
         _, mean_val, median_val = self.interpret_skewness_by_median(N, K, n)
         
         return {
@@ -519,12 +677,7 @@ class PoissonDistribution(BaseDistribution):
         return interpretation, comparison, label
     
     def interpret_kurtosis(self, kurtosis: float) -> Tuple[str, str]:
-        if kurtosis < -0.5:
-            return "Platicúrtica: La distribución es más plana que una normal (colas ligeras).", "Platicúrtica"
-        elif kurtosis > 0.5:
-            return "Leptocúrtica: La distribución es más picuda que una normal (colas pesadas).", "Leptocúrtica"
-        else:
-            return "Mesocúrtica: La distribución tiene forma similar a la campana de Gauss.", "Mesocúrtica (campana de Gauss)"
+        return _lookup(kurtosis, _POISSON_KURTOSIS_THRESHOLDS, _POISSON_KURTOSIS_MSGS, _POISSON_KURTOSIS_MSGS[1])
     
     def calculate(self, **kwargs: Any) -> Dict[str, Any]:
         lambda_param: float = kwargs.get('lambda_param')
@@ -559,17 +712,8 @@ class PoissonDistribution(BaseDistribution):
             probability_x_pct = round(probability_x * 100, 6)
             cumulative_prob_x = float(stats.poisson.cdf(x, lambda_param))
             
-            range_probs = []
-            cum_sum = 0.0
-            for i in range(x + 1):
-                prob = self.calculate_probability(lambda_param, i)
-                cum_sum += prob
-                range_probs.append({
-                    'x': i,
-                    'p': round(prob * 100, 4),
-                    'cumulative': round(cum_sum * 100, 4)
-                })
-            range_probabilities = range_probs
+            range_pmf = stats.poisson.pmf(np.arange(x + 1), lambda_param)
+            range_probabilities = build_range_probs(range(x + 1), range_pmf * 100, np.cumsum(range_pmf) * 100, x)
         
         range_probability = None
         range_probability_pct = None
@@ -620,9 +764,9 @@ class PoissonDistribution(BaseDistribution):
         max_x = int(lambda_param + 4 * math.sqrt(lambda_param)) + 1
         max_x = max(max_x, 20)
         
-        x_values = list(range(max_x + 1))
-        probabilities = [round(self.calculate_probability(lambda_param, x) * 100, 4) for x in x_values]
-        return x_values, probabilities
+        x_values = np.arange(max_x + 1)
+        probabilities = np.round(stats.poisson.pmf(x_values, lambda_param) * 100, 4)
+        return x_values.tolist(), probabilities.tolist()
     
     def get_statistics(self, **kwargs: Any) -> Dict[str, Any]:
         lambda_param: float = kwargs.get('lambda_param')
@@ -652,14 +796,21 @@ class DistributionFactory:
     @classmethod
     def register(cls, name: str, distribution_class: type[BaseDistribution]) -> None:
         cls._distributions[name.lower()] = distribution_class
+        cls._get_class.cache_clear()
     
     @classmethod
-    def create(cls, distribution_type: str) -> BaseDistribution:
+    @functools.lru_cache(maxsize=8)
+    def _get_class(cls, distribution_type: str) -> type[BaseDistribution]:
         distribution_type = distribution_type.lower()
-        if distribution_type not in cls._distributions:
+        try:
+            return cls._distributions[distribution_type]
+        except KeyError:
             available = ', '.join(cls._distributions.keys())
-            raise ValueError(f"Distribución '{distribution_type}' no disponible. Opciones: {available}")
-        return cls._distributions[distribution_type]()
+            raise ValueError(f"Distribución '{distribution_type}' no disponible. Opciones: {available}") from None
+    
+    @classmethod
+    def create(cls, distribution_type: str) -> BaseDistribution:
+        return cls._get_class(distribution_type)()
     
     @classmethod
     def get_available_distributions(cls) -> List[str]:
@@ -2,6 +2,8 @@ from typing import Dict, Any, Optional, Tuple, Literal
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
 
 class DistributionType(Enum):
     BINOMIAL = "binomial"
@@ -106,15 +108,18 @@ class ModelSelector:
         distribution = DistributionFactory.create(distribution_type)
         
         dist_params = params['distribution_params']
-        results = distribution.calculate(**dist_params)
+        sweep_params = {k: v for k, v in dist_params.items() if k != 'x'}
+        
+        # El barrido se calcula primero y P(X=x) se lee de la misma tabla en lugar de evaluarse otra vez.
+        # Las probabilidades del grafico salen del mismo arreglo: sin cache para n grandes, pedir el barrido lo recalcularia.
+        pmf_array = distribution.get_pmf_array(**sweep_params)
+        x_values = list(range(len(pmf_array)))
+        probabilities = np.round(pmf_array * 100, 4).tolist()
         
-        x_values, probabilities = distribution.get_probabilities(**{k: v for k, v in dist_params.items() if k != 'x'})
+        # decide() ya valido N, K y n; la distribucion solo valida x.
+        results = distribution.calculate(**dist_params, _validated=True, _pmf_array=pmf_array)
         
-        cumulative_probs = []
-        cumulative_sum = 0
-        for prob in probabilities:
-            cumulative_sum += prob
-            cumulative_probs.append(round(cumulative_sum, 4))
+        cumulative_probs = np.cumsum(np.asarray(probabilities, dtype=np.float64)).round(4).tolist()
         
         return {
             'model_decision': {
@@ -0,0 +1,16 @@
+import base64
+from typing import Any
+
+import numpy as np
+import orjson
+
+
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps_json(data: Any) -> str:
+    return orjson.dumps(data, option=JSON_OPTIONS).decode()
+
+
+def encode_float32(values: Any) -> str:
+    return base64.b64encode(np.asarray(values, dtype='<f4').tobytes()).decode('ascii')
@@ -2,10 +2,16 @@ import Chart from 'chart.js/auto';
 
 interface DistributionChartConfig {
   labels: string[];
-  values: number[];
+  values_b64: string;
   x_values: number[];
 }
 
+// Las vistas envían las probabilidades como float32 little-endian codificado en base64.
+function decodeFloat32Base64(encoded: string): number[] {
+  const bytes = Uint8Array.from(atob(encoded), (char) => char.charCodeAt(0));
+  return Array.from(new Float32Array(bytes.buffer));
+}
+
 export class DistributionChart {
   private chart: Chart | null = null;
   private canvas: HTMLCanvasElement;
@@ -36,7 +42,7 @@ export class DistributionChart {
         labels: data.labels,
         datasets: [{
           label: 'Probabilidad (%)',
-          data: data.values,
+          data: decodeFloat32Base64(data.values_b64),
           backgroundColor: gradient,
           borderColor: 'rgba(20, 184, 166, 1)',
           borderWidth: 1,
@@ -114,7 +120,7 @@ export class DistributionChart {
   update(data: DistributionChartConfig): void {
     if (this.chart) {
       this.chart.data.labels = data.labels;
-      this.chart.data.datasets[0].data = data.values;
+      this.chart.data.datasets[0].data = decodeFloat32Base64(data.values_b64);
       this.chart.update();
     } else {
       this.render(data);